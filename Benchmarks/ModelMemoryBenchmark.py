@@ -0,0 +1,189 @@
+# Memory footprint of the MQ model classes: retained bytes for 100k queues and 100k
+# application connections, before (plain __dict__ objects, as the models were originally
+# written) and after (slotted models + interned repeated strings).
+#
+# Each side parses the same JSON text and the JSON tree is dropped before measuring, so the
+# numbers are what a cached snapshot actually keeps alive.
+#
+# Run from the repository root:  python -m Benchmarks.ModelMemoryBenchmark
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from MQRestAPI.MQ import Parser
+
+N_QUEUES = 100_000
+N_CONNECTIONS = 100_000
+
+
+#############################
+#   ORIGINAL (__dict__)     #
+#############################
+
+class LegacyLocalQueue:
+    def __init__(self):
+        self.queue_name = None
+        self.type_name = None
+        self.inhibit_put = None
+        self.description = None
+        self.time_altered = None
+        self.current_depth = None
+        self.max_number_of_messages = None
+        self.max_message_length = None
+        self.inhibit_get = None
+        self.time_created = None
+
+
+class LegacyConnectedObject:
+    def __init__(self, objname=None, objtype=None, hstate=None, reada=None, openopts=None):
+        self.objname = objname
+        self.objtype = objtype
+        self.hstate = hstate
+        self.reada = reada
+        self.openopts = openopts
+
+
+class LegacyApplication:
+    def __init__(self, conn, channel, type, conntag, conname, connopts, appltype, appldesc, appltag, connected_objects):
+        self.conn = conn
+        self.channel = channel
+        self.type = type
+        self.conntag = conntag
+        self.conname = conname
+        self.connopts = connopts
+        self.appltype = appltype
+        self.appldesc = appldesc
+        self.appltag = appltag
+        self.connected_objects = connected_objects
+
+
+def legacy_parse_queues(queue_response_json):
+    queues = []
+    for queue_json in queue_response_json['queue']:
+        queue = LegacyLocalQueue()
+        queue.current_depth = queue_json['status']['currentDepth']
+        queue.max_number_of_messages = queue_json['storage']['maximumDepth']
+        queue.max_message_length = queue_json['storage']['maximumMessageLength']
+        queue.time_created = queue_json['timestamps']['created']
+        queue.threshold = (queue.current_depth / queue.max_number_of_messages) * 100
+        queue.inhibit_get = queue_json['general']['inhibitGet']
+        queue.type_name = 'Local'
+        queue.queue_name = queue_json['name']
+        queue.inhibit_put = queue_json['general']['inhibitPut']
+        queue.description = queue_json['general']['description']
+        queue.time_altered = queue_json['timestamps']['altered']
+        queues.append(queue)
+    return queues
+
+
+def legacy_parse_applications(application_response_json):
+    applications = []
+    for application_json in application_response_json['commandResponse']:
+        params = application_json['parameters']
+        connected_objects = [LegacyConnectedObject(obj['objname'], obj['objtype'], obj['hstate'], obj['reada'],
+                                                   obj.get('openopts')) for obj in params.get('objects', [])]
+        applications.append(LegacyApplication(
+            conn=params['conn'], channel=params['channel'], type=params['appltype'], conntag=params['conntag'],
+            conname=params['conname'], connopts=params['connopts'], appltype=params['appltype'],
+            appldesc=params['appldesc'], appltag=params['appltag'], connected_objects=connected_objects))
+    return applications
+
+
+#############################
+#      SYNTHETIC DATA       #
+#############################
+
+def queue_listing_text(n):
+    return json.dumps({"queue": [{
+        "name": f"APP{i % 50}.QUEUE.{i}",
+        "type": "local",
+        "general": {"isTransmissionQueue": False, "inhibitGet": False, "inhibitPut": False, "description": ""},
+        "status": {"currentDepth": i % 5000},
+        "storage": {"maximumDepth": 5000, "maximumMessageLength": 4194304},
+        # definitions are typically created in batches, so timestamps repeat across queues
+        "timestamps": {"created": f"2023-07-{1 + i % 28:02d}T16:06:56.000Z",
+                       "altered": f"2023-08-{1 + i % 28:02d}T09:{i % 60:02d}:00.000Z"}
+    } for i in range(n)]})
+
+
+def connection_listing_text(n):
+    # one connection per row, each with one open queue, as DISPLAY CONN(*) TYPE(*) returns them
+    return json.dumps({"commandResponse": [{"completionCode": 0, "parameters": {
+        "conn": f"{i:016X}",
+        "channel": f"APP{i % 20}.SVRCONN",
+        "appltype": "USER",
+        "appldesc": "",
+        "appltag": f"order-service-{i % 20}",
+        "conname": f"10.0.{(i // 250) % 250}.{i % 250}",
+        "connopts": ["MQCNO_SHARED_BINDING"],
+        "conntag": "",
+        "objects": [{"objname": f"APP{i % 50}.QUEUE.{i % 1000}", "objtype": "QUEUE", "hstate": "ACTIVE",
+                     "reada": "NO", "openopts": ["MQOO_INPUT_SHARED"]}]
+    }} for i in range(n)]})
+
+
+#############################
+#        MEASUREMENT        #
+#############################
+
+def retained_bytes(parse, text):
+    """
+    Bytes still allocated after parsing `text` with `parse` and dropping the JSON tree.
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    response_json = json.loads(text)
+    objects = parse(response_json)
+    del response_json
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return retained, objects
+
+
+def serialise_seconds(objects, to_dict):
+    start = time.perf_counter()
+    for obj in objects:
+        to_dict(obj)
+    return time.perf_counter() - start
+
+
+def legacy_application_to_dict(app):
+    # the original Application.to_dict, applied to the legacy layout
+    as_dict = dict(app.__dict__)
+    as_dict['connected_objects'] = [dict(obj.__dict__) for obj in app.connected_objects]
+    return as_dict
+
+
+def report(label, count, before, after):
+    print(f"{label:<28}{before / count:>12.1f}{after / count:>12.1f}{before / 2**20:>12.1f}{after / 2**20:>12.1f}"
+          f"{100 * (1 - after / before):>9.1f}%")
+
+
+def main():
+    print(f"Python {sys.version.split()[0]}")
+    queues_text = queue_listing_text(N_QUEUES)
+    connections_text = connection_listing_text(N_CONNECTIONS)
+
+    queues_before, legacy_queues = retained_bytes(legacy_parse_queues, queues_text)
+    queues_after, queues = retained_bytes(Parser.parse_queue_response, queues_text)
+    apps_before, legacy_apps = retained_bytes(legacy_parse_applications, connections_text)
+    apps_after, apps = retained_bytes(Parser.parse_application_response, connections_text)
+
+    print(f"{'':<28}{'B/obj before':>12}{'B/obj after':>12}{'MiB before':>12}{'MiB after':>12}{'saved':>10}")
+    report(f"{N_QUEUES} queues", N_QUEUES, queues_before, queues_after)
+    report(f"{N_CONNECTIONS} connections", N_CONNECTIONS, apps_before, apps_after)
+
+    print()
+    print(f"to_dict, {N_QUEUES} queues:        before {serialise_seconds(legacy_queues, lambda q: dict(q.__dict__)):.3f}s"
+          f"  after {serialise_seconds(queues, lambda q: q.to_dict()):.3f}s")
+    print(f"to_dict, {N_CONNECTIONS} connections:   before {serialise_seconds(legacy_apps, legacy_application_to_dict):.3f}s"
+          f"  after {serialise_seconds(apps, lambda a: a.to_dict()):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,38 @@
 import atexit
+import functools
+import hashlib
 import signal
 import json
 import os
 import requests
 import sys
 import threading
-from flask import Flask, request, jsonify
+import time
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_restful import Api, Resource
 from flask_caching import Cache
 import urllib3
 
 # CUSTOM MODULES
 import MQRestAPI.MQ
+import MQRestAPI.AsyncMQ
+from MQRestAPI.ClientRegistry import ClientRegistry, FanOutCollector
+from MQRestAPI.DependencyGraph import DependencyGraph, QUEUE, CHANNEL, APPLICATION, build_network_graph
+from MQRestAPI.GraphClusters import GraphClusters, GROUPINGS
+from MQRestAPI.GraphLayout import GraphLayout, GRID_CELLS
+from MQRestAPI.Query import QUEUE_PROFILES, CHANNEL_PROFILES, APPLICATION_PROFILES
 from ChatBot.MainChatBot import boot_chatbot, get_issue_message_chatbot_response, get_general_chatbot_response, ThreadSafeChatbot
-from IssueLogging import ThreadsafeIssueList, QueueThresholdsConfig
+from IssueLogging import QueueThresholdsConfig
+from IssueLogging.IssueStore import IssueStore
+from IssueLogging.IssueHistory import IssueHistory
+from IssueLogging.ThresholdEvaluator import evaluate_thresholds
+from IssueLogging.IssueLog import IssueLog
+from Monitoring.DeltaEngine import QueueDeltaEngine
+from Monitoring.SnapshotPoller import SnapshotPoller
+from Monitoring.DepthHistory import DepthHistory
+from Monitoring.SerializedSnapshots import SerializedSnapshotCache
+from Monitoring.ObjectIndex import ObjectIndex
+from Monitoring.SnapshotIndex import SnapshotIndexCache, QUEUE_INDEX, CHANNEL_INDEX, APPLICATION_INDEX
 from JavaApp.BootJava import start_spring_app_with_properties
 
 
@@ -32,20 +51,41 @@ api = Api(app)
 cache = Cache(app, config={'CACHE_TYPE': 'simple'})
 
 
-resolved_issues = Cache(app, config={
-    'CACHE_TYPE': 'simple'
-})
-
-
 # Insantiating threadsafe queue threshold configuration
 queueThresholdManager = QueueThresholdsConfig.QueueThresholdManager()
 
-# Logging of issues - threadsafe
-issue_list = ThreadsafeIssueList.ThreadSafeIssueList()
+# last queue snapshot, turned into versioned added/removed/changed deltas on every refresh
+queue_delta_engine = QueueDeltaEngine()
+
+# bounded per-queue depth time series fed by every queue snapshot (rates, trend, time-to-full)
+depth_history = DepthHistory(capacity=60)
+
+# JSON body + ETag rendered once per distinct snapshot, for conditional GETs on the object endpoints
+snapshot_bodies = SerializedSnapshotCache()
+
+# name / type / depth / sort indexes per snapshot, for paged list requests
+snapshot_indexes = SnapshotIndexCache()
+
+# queue / channel / application by name, kept next to the cached snapshots for issue enrichment
+object_index = ObjectIndex()
+
+# Open issues, one entry per (mqobjectName, issueCode) with repeats coalesced - threadsafe, bounded
+issue_store = IssueStore(max_issues=5000)
+
+# every newly opened issue, sequence numbered, for any number of /issuestream and /issues/poll subscribers
+issue_log = IssueLog(capacity=10000)
+
+# durable record of every opened issue, written in batches by a background thread; survives logout
+issue_history = IssueHistory(os.environ.get('ISSUE_HISTORY_URL', 'sqlite:///issue_history.db'))
+atexit.register(issue_history.close)
 
 # global client, must first be posted to for MQRestAPI to work
 client = None
 
+# one authenticated client per queue manager, queried in parallel by the fan-out collector
+client_registry = ClientRegistry()
+fan_out_collector = FanOutCollector(client_registry, max_workers=8)
+
 # Chat Bot connection and instantiation
 # retrieval_chain, conversation_chain = None, None
 chatbot = ThreadSafeChatbot()
@@ -55,17 +95,20 @@ process = None
 java_app_start_event = threading.Event()
 java_login_event = threading.Event()
 java_login_message = None
+# java_config is replaced, never modified in place: readers take the current (version, config)
+# snapshot without locking, java_config_lock only serialises writers
 java_config_lock = threading.Lock()
 java_config = None
+java_config_snapshot = (0, None)
 
 def set_java_config(obj):
     with java_config_lock:
-        global java_config
+        global java_config, java_config_snapshot
         java_config = obj
+        java_config_snapshot = (java_config_snapshot[0] + 1, obj)
 
 def get_java_config():
-    with java_config_lock:
-        return java_config
+    return java_config_snapshot[1]
 
 
 #############################
@@ -106,8 +149,16 @@ class ClientConfig(Resource):
         # clear caches
         print('CONFIG=', get_java_config())
         set_java_config(None)
-        resolved_issues.clear()
+        issue_store.clear_resolved()
+        snapshot_poller.stop()
+        snapshot_poller.clear()
         cache.clear()
+        queue_delta_engine.clear()
+        depth_history.clear()
+        clear_dependency_graph()
+        snapshot_bodies.clear()
+        snapshot_indexes.clear()
+        object_index.clear()
         queueThresholdManager.clear_thresholds()
 
         #shutoff maven app if it is running
@@ -133,6 +184,7 @@ class ClientConfig(Resource):
             url = "https://" + address + ":" + admin_port
 
             client = MQRestAPI.MQ.Client(url=url, qmgr=qmgr, username=username, password=password)
+            client_registry.register(client)
         except Exception as e:
             # Check if the exception message indicates a timeout
             if "timed out" in str(e):
@@ -151,6 +203,9 @@ class ClientConfig(Resource):
                 # SUCCESFULL LOG IN
                 print("Login successful")
 
+                # keep MQ object snapshots fresh in the background
+                snapshot_poller.start()
+
                 # Boot a new chatbot with a fresh memory
                 print("Booting new chatbot")
                 chatbot.boot()
@@ -244,9 +299,19 @@ class Logout(Resource):
         print('CONFIG=', get_java_config())
         # client = None  # Reset the MQRestAPI client object
         # post
+        snapshot_poller.stop()  # Stop polling mqweb
+        snapshot_poller.clear()
         cache.clear()  # Clear the cache
-        issue_list.clear_issues()  # Clear the list of issues
-        resolved_issues.clear()
+        queue_delta_engine.clear()
+        depth_history.clear()
+        clear_dependency_graph()
+        snapshot_bodies.clear()
+        snapshot_indexes.clear()
+        object_index.clear()
+        client_registry.clear()  # Forget the per queue manager logins
+        clear_network_graph()
+        issue_store.clear()  # Clear the open and resolved issues
+        issue_log.clear()
         queueThresholdManager.clear_thresholds()
         java_login_message = None
         wait_and_terminate() #terminate java app
@@ -258,23 +323,29 @@ class Logout(Resource):
 #                                           Issue Handling                                                 #
 ############################################################################################################
 
-class IssueListResource(Resource):
+# long-poll wait and SSE keep-alive period, in seconds
+ISSUE_POLL_TIMEOUT = 25
+ISSUE_STREAM_HEARTBEAT = 15
 
-    def get(self):
-        issues = issue_list.get_issues()
 
-        # After fetching, clear the issues from the issue list
-        issue_list.clear_issues()
+def log_issue(issue):
+    # repeats of an open issue only bump its count; the subscribers hear about each issue once
+    opened = issue_store.add(issue)
+    if opened is not None:
+        issue_log.append(opened)
+        issue_history.record(opened)  # queued only, the insert happens on the writer thread
 
-        # Filter out issues that are in the 'resolved_issues' cache.
-        unresolved_issues = []
-        for issue in issues:
-            cache_key = (issue['mqobjectName'], issue['issueCode'])
-            if not resolved_issues.get(cache_key):
-                unresolved_issues.append(issue)
 
+def is_resolved(issue):
+    return issue_store.is_resolved(issue['mqobjectName'], issue.get('issueCode'))
 
-        return {"issues": unresolved_issues}
+
+class IssueListResource(Resource):
+
+    def get(self):
+        # Each open issue is returned once; it stays open (and its repeats coalesced) until resolved
+        # or stale, so an ongoing condition is neither re-reported nor re-logged
+        return {"issues": issue_store.deliver()}
 
 
     def post(self):
@@ -288,79 +359,141 @@ class IssueListResource(Resource):
             if not all(field in data for field in ["mqobjectType", "mqobjectName"]):
                 return {"message": "Missing required fields. Ensure each issue has 'mqobjectType' and 'mqobjectName'."}
 
-            data['object_details'] = 'N/A'
-
-            # Depending on the object type, search in the appropriate cache and add object details to data
-            if data['mqobjectType'] == 'application':
-                applications = cache.get('all_applications')
-                for app in applications:
-                    if app.conn == data['mqobjectName']:
-                        data['object_details'] = app.to_dict()
-                        break
-            elif data['mqobjectType'] == 'channel':
-                channels = cache.get('all_channels')
-                for channel in channels:
-                    if channel.channel_name == data['mqobjectName']:
-                        data['object_details'] = channel.to_dict()
-                        break
-            elif data['mqobjectType'] == 'queue':
-                queues = cache.get('all_queues')
-                for queue in queues:
-                    if queue.queue_name == data['mqobjectName']:
-                        data['object_details'] = queue.to_dict()
-                        break
+            # Depending on the object type, look the object up in the cached snapshot and add its details to data
+            mq_object = object_index.get(data['mqobjectType'], data['mqobjectName'])
+            data['object_details'] = mq_object.to_dict() if mq_object is not None else 'N/A'
 
             # append the issue to the issue list
-            issue_list.add_issue(data)
+            log_issue(data)
 
         return {"message": f"{len(issues)} issues added successfully!"}
 
 
-class QueueThresholdConfig(Resource):
+def history_range_from_args():
+    # ?from= / ?to= as unix timestamps, defaulting to the last 24 hours
+    end = request.args.get('to', time.time(), type=float)
+    start = request.args.get('from', end - 24 * 3600, type=float)
+    return start, end
+
+
+class IssueHistoryResource(Resource):
     def get(self):
-        global java_config
+        start, end = history_range_from_args()
+        limit = min(request.args.get('limit', 1000, type=int), 10000)
+        issues = issue_history.issues(start, end, mqobject_name=request.args.get('mqobjectName'),
+                                      issue_code=request.args.get('issueCode'), limit=limit)
+        return {"issues": issues, "from": start, "to": end}
 
 
-        print('CONFIG=', get_java_config())
-        if get_java_config():
-            print('THIS CONFIG WAS STORED FROM LAST TIME')
-        # Ensure the thresholds are read in a thread-safe manner
-        with queueThresholdManager._lock:
-            thresholds = queueThresholdManager._thresholds.copy()
-
-        # If java_config is not already loaded, fetch it
-        if get_java_config() is None:
-            set_java_config(requests.get("https://localhost:8080/configurations", verify=False).text)
-            print('Received config via Java.get/configurations:', get_java_config())
-
-        # Ensure java_config is a dictionary
-        if isinstance(get_java_config(), str):
-            x = get_java_config()
-            set_java_config(json.loads(x))
-
-        # Get queue thresholds from java_config
-        queue_thresholds = get_java_config()['retrievedThresholds'].get('queues', {}).get('queueThresholds', {})
-
-        for queue, depth in queue_thresholds.copy().items():
-            if queue not in thresholds:
-                queue_thresholds.pop(queue)
-
-
-        # Update the queue thresholds using the provided data
-        for queue, depth in thresholds.items():
-            if queue in queue_thresholds:
-                queue_thresholds[queue]['depth'] = depth
-            else:
-                # If the queue doesn't exist, add it with given depth and a default activity of 200
-                queue_thresholds[queue] = {'depth': depth, 'activity': 200}
+class IssuesOverTime(Resource):
+    def get(self):
+        start, end = history_range_from_args()
+        bucket = request.args.get('bucket', 3600, type=float)
+        if bucket <= 0 or (end - start) / bucket > 10000:
+            return {"message": "bucket must be positive and give at most 10000 buckets."}, 400
 
-        # Update the main config
-        temp = get_java_config().copy()
-        temp['retrievedThresholds']['queues']['queueThresholds'] = queue_thresholds
-        set_java_config(temp)
+        buckets = issue_history.counts_over_time(start, end, bucket, mqobject_name=request.args.get('mqobjectName'),
+                                                 issue_code=request.args.get('issueCode'))
+        return {"buckets": buckets, "bucket": bucket, "from": start, "to": end}
 
 
-        return get_java_config()
+class IssuePoll(Resource):
+    def get(self):
+        """
+        Long poll: returns as soon as there are issues after ?cursor= (or after ?timeout= seconds
+        with none). Pass the returned cursor to the next call; missed is True when issues after
+        the given cursor are no longer retained.
+        """
+        cursor = request.args.get('cursor', type=int)
+        timeout = min(request.args.get('timeout', ISSUE_POLL_TIMEOUT, type=float), ISSUE_POLL_TIMEOUT)
+
+        entries, cursor, missed = issue_log.wait(cursor, max(timeout, 0))
+        return {"issues": [issue for _, issue in entries if not is_resolved(issue)],
+                "cursor": cursor, "missed": missed}
+
+
+class IssueStream(Resource):
+    def get(self):
+        """
+        Server-Sent Events: one 'issue' event per new issue, with its sequence number as the
+        event id, so a reconnecting EventSource resumes from Last-Event-ID. A 'reset' event
+        tells the subscriber that issues were missed and it should reload the full list.
+        """
+        cursor = request.headers.get('Last-Event-ID', type=int)
+        if cursor is None:
+            cursor = request.args.get('cursor', type=int)
+        if cursor is None:
+            cursor = issue_log.last_seq  # new subscribers only get issues raised from now on
+
+        def events(cursor):
+            yield 'retry: 2000\n\n'
+            while True:
+                entries, cursor, missed = issue_log.wait(cursor, ISSUE_STREAM_HEARTBEAT)
+                if missed:
+                    yield f'id: {cursor}\nevent: reset\ndata: {{}}\n\n'
+                if not entries:
+                    yield ': keep-alive\n\n'
+                for seq, issue in entries:
+                    if not is_resolved(issue):
+                        yield f'id: {seq}\nevent: issue\ndata: {json.dumps(issue)}\n\n'
+
+        return Response(stream_with_context(events(cursor)), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+# serialised GET /queuethresholdmanager body and the (java config, thresholds) versions it was built from
+threshold_config_body = (None, None)
+
+
+def load_java_config():
+    """
+    The current (version, java config dict), fetching it from the Java app on first use.
+    """
+    version, config = java_config_snapshot
+    if config is None:
+        set_java_config(requests.get("https://localhost:8080/configurations", verify=False).text)
+        print('Received config via Java.get/configurations:', get_java_config())
+        version, config = java_config_snapshot
+
+    # Ensure java_config is a dictionary
+    if isinstance(config, str):
+        set_java_config(json.loads(config))
+        version, config = java_config_snapshot
+    return version, config
+
+
+def merge_queue_thresholds(config, rules):
+    """
+    A copy of `config` whose queue thresholds are the manager's rules: entries without a rule are
+    dropped, the depth of the others is the rule, and new rules get a default activity of 200.
+    `config` itself is left untouched.
+    """
+    queues_config = config['retrievedThresholds'].get('queues', {})
+    queue_thresholds = queues_config.get('queueThresholds', {})
+
+    merged = {queue: dict(settings, depth=rules[queue]) for queue, settings in queue_thresholds.items()
+              if queue in rules}
+    for queue, depth in rules.items():
+        if queue not in merged:
+            merged[queue] = {'depth': depth, 'activity': 200}
+
+    retrieved_thresholds = dict(config['retrievedThresholds'], queues=dict(queues_config, queueThresholds=merged))
+    return dict(config, retrievedThresholds=retrieved_thresholds)
+
+
+class QueueThresholdConfig(Resource):
+    def get(self):
+        global threshold_config_body
+
+        version, config = load_java_config()
+        thresholds = queueThresholdManager.snapshot()
+
+        versions, body = threshold_config_body
+        if versions != (version, thresholds.version):
+            body = json.dumps(merge_queue_thresholds(config, thresholds.rules))
+            threshold_config_body = ((version, thresholds.version), body)
+
+        return Response(body, mimetype='application/json')
 
     def post(self):
         global java_config
@@ -400,6 +533,32 @@ class QueueThresholdConfig(Resource):
         return {"message": "Configuration updated successfully."}
 
 
+class AlertingConfig(Resource):
+    def get(self):
+        return {'Alerting': queueThresholdManager.alert_states.settings(),
+                'Alerting_Queues': queueThresholdManager.alert_states.states()}
+
+    def post(self):
+        # {"clear_margin": 5, "min_alert_interval": 60, "reminder_interval": 300}; reminder_interval null disables reminders
+        data = request.get_json(force=True)
+        settings = ('clear_margin', 'min_alert_interval', 'reminder_interval')
+        if not isinstance(data, dict) or not all(setting in settings for setting in data):
+            return {"message": f"Expecting any of {list(settings)}."}
+
+        for setting, value in data.items():
+            if value is None and setting == 'reminder_interval':
+                continue
+            if not isinstance(value, (int, float)) or value < 0:
+                return {"message": f"{setting} must be a non-negative number."}
+
+        queueThresholdManager.alert_states.configure(clear_margin=data.get('clear_margin'),
+                                                     min_alert_interval=data.get('min_alert_interval'),
+                                                     reminder_interval=data.get('reminder_interval'),
+                                                     no_reminders='reminder_interval' in data and
+                                                                  data['reminder_interval'] is None)
+        return {"message": "Alerting configuration updated.", 'Alerting': queueThresholdManager.alert_states.settings()}
+
+
 class ResolveIssue(Resource):
     def post(self):
         data = request.get_json(force=True)
@@ -409,9 +568,8 @@ class ResolveIssue(Resource):
         if not mqobject_name or not issue_code:
             return {"message": "Both 'mqobjectName' and 'issueCode' are required."}, 200
 
-        # Create a unique key for this combination of mqobjectName and issueCode
-        cache_key = (mqobject_name, issue_code)
-        resolved_issues.set(cache_key, 'resolved', timeout=60)
+        # Close the issue for this combination of mqobjectName and issueCode
+        issue_store.resolve(mqobject_name, issue_code, timeout=60)
 
         return {"message": "(mqobjectName, issueCode) pair added to resolved issues."}, 200
 
@@ -422,8 +580,7 @@ class ResolveIssue(Resource):
         if not mqobject_name or not issue_code:
             return {"message": "Both 'mqobjectName' and 'issueCode' are required."}, 200
 
-        cache_key = (mqobject_name, issue_code)
-        if resolved_issues.get(cache_key):
+        if issue_store.is_resolved(mqobject_name, issue_code):
             return {"status": "resolved", "mqobjectName": mqobject_name, "issueCode": issue_code}, 200
         else:
             return {"status": "unresolved", "mqobjectName": mqobject_name, "issueCode": issue_code}, 200
@@ -466,64 +623,777 @@ class ChatBotQuery(Resource):
         return {"message": response}
 
 
+############################################################################################################
+#                                           Background Refresh                                             #
+############################################################################################################
+
+# (interval, max staleness) in seconds per object type; endpoints serve the latest snapshot and only
+# wake the refresher early once it is older than its staleness bound
+POLL_INTERVALS = {
+    'queues': (5, 10),
+    'channels': (30, 60),
+    'applications': (10, 20),
+    'qmgrs': (60, 120)
+}
+
+def cache_objects(object_type, objects, timeout=None):
+    # the snapshot under all_<object type>s, plus its name index for issue enrichment
+    cache.set(f'all_{object_type}s', objects, timeout=timeout)
+    object_index.update(object_type, objects)
+
+
+def render_queues(queue_dicts):
+    return {'All_Queues': queue_dicts}
+
+
+def render_channels(channels):
+    return {'All_Channels': [ch.to_dict() if hasattr(ch, 'to_dict') else 'Not a channel instance' for ch in channels]}
+
+
+def render_applications(applications):
+    return {'All_Applications': [app.to_dict() for app in applications]}
+
+
+def render_qmgrs(qmgrs):
+    return {'All_Queue_Managers': [qmgr.to_dict() for qmgr in qmgrs]}
+
+
+# refreshed snapshots never expire from the cache; the poller owns their freshness.
+# Each refresh also pre-renders the response body, so polls never serialise on the request path.
+def refresh_queues():
+    """
+    Streams the full queue listing through the delta engine, which only re-parses altered
+    definitions, then checks the thresholds of the whole snapshot in one vectorised pass and
+    samples its depths. Returns the queue dicts served by /getallqueues. Depth trends are only
+    attached on request (?trends=true, see with_depth_trends): they move on every poll, and
+    keeping them in the snapshot would change its ETag even when nothing in MQ did.
+    """
+    if client is None:
+        return None
+    queue_delta_engine.update(client.iter_all_queue_jsons())
+    queues = queue_delta_engine.queues()
+    check_queue_thresholds(queues)
+    depth_history.record(queues)
+    cache_objects('queue', queues, timeout=0)
+
+    queue_dicts = queue_delta_engine.queue_dicts()
+    snapshot_bodies.get('queues', queue_dicts, render_queues)
+    return queue_dicts
+
+
+def refresh_channels():
+    if client is None:
+        return None
+    channels = client.get_all_channels()
+    cache_objects('channel', channels, timeout=0)
+    snapshot_bodies.get('channels', channels, render_channels)
+    return channels
+
+
+def refresh_applications():
+    if client is None:
+        return None
+    applications = client.get_all_applications()
+    cache_objects('application', applications, timeout=0)
+    snapshot_bodies.get('applications', applications, render_applications)
+    return applications
+
+
+def refresh_qmgrs():
+    if client is None:
+        return None
+    qmgrs = client.get_all_queue_managers()
+    cache.set('all_qmgrs', qmgrs, timeout=0)
+    snapshot_bodies.get('qmgrs', qmgrs, render_qmgrs)
+    return qmgrs
+
+
+snapshot_poller = SnapshotPoller({
+    'queues': (refresh_queues, *POLL_INTERVALS['queues']),
+    'channels': (refresh_channels, *POLL_INTERVALS['channels']),
+    'applications': (refresh_applications, *POLL_INTERVALS['applications']),
+    'qmgrs': (refresh_qmgrs, *POLL_INTERVALS['qmgrs'])
+})
+
+
+class PollerConfig(Resource):
+    def get(self):
+        return {'Poller': snapshot_poller.status()}
+
+    def post(self):
+        # {"queues": {"interval": 5, "max_staleness": 10}, ...}
+        data = request.get_json(force=True)
+        if not isinstance(data, dict) or not all(object_type in snapshot_poller.object_types() for object_type in data):
+            return {"message": f"Expecting settings keyed by object type: {snapshot_poller.object_types()}."}
+
+        updates = {object_type: [settings.get('interval'), settings.get('max_staleness')]
+                   for object_type, settings in data.items()}
+        for values in updates.values():
+            if not all(value is None or (isinstance(value, (int, float)) and value > 0) for value in values):
+                return {"message": "Interval and max_staleness must be positive numbers of seconds."}
+
+        for object_type, values in updates.items():
+            snapshot_poller.configure(object_type, *values)
+
+        return {"message": "Poller configuration updated.", 'Poller': snapshot_poller.status()}
+
+
 ############################################################################################################
 #                                               MQ Objects                                                 #
 ############################################################################################################
 
+def requires_login(method):
+    # the MQ object and graph resources read the poller's snapshots and the client, both None until
+    # /clientconfig has logged in
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if client is None:
+            return {"message": "Not logged in. Post the queue manager details to /clientconfig first."}, 401
+        return method(*args, **kwargs)
+    return wrapper
+
+
+def snapshot_response(object_type, render):
+    """
+    Serves the latest background snapshot of `object_type` as a conditional GET: 304 when the
+    client's If-None-Match still matches, otherwise the body pre-rendered for this snapshot.
+    """
+    serialized = snapshot_bodies.get(object_type, snapshot_poller.get(object_type), render)
+
+    if request.if_none_match.contains_weak(serialized.etag):
+        response = Response(status=304)
+    else:
+        response = Response(serialized.body, mimetype='application/json')
+    response.set_etag(serialized.etag)
+    response.headers['Cache-Control'] = 'no-cache'  # always revalidate, the snapshot moves every poll
+    response.headers['X-Snapshot-Version'] = str(serialized.version)
+    return response
+
+
+# any of these on a full-profile request selects a page of the cached snapshot instead of all of it
+PAGE_ARGS = ('name', 'type', 'min_depth', 'sort', 'limit', 'cursor')
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+
+def is_page_request():
+    return request.args.get('profile', 'full') == 'full' and any(arg in request.args for arg in PAGE_ARGS)
+
+
+def snapshot_page(object_type, key, spec, rows, decorate=None):
+    """
+    One page of the latest snapshot of `object_type`, selected through its indexes:
+    ?type= ?name=DEV.* (prefix or glob) ?min_depth=<percent> ?sort=[-]<field> ?limit= ?cursor=
+    Only the returned rows are serialised; decorate(rows) -> rows adds per-request fields to them.
+    """
+    index = snapshot_indexes.get(object_type, snapshot_poller.get(object_type), rows, spec)
+
+    sort = request.args.get('sort', 'name')
+    descending = sort.startswith('-')
+    sort = sort.lstrip('-')
+    if sort not in spec.sort_fields:
+        return {"message": f"Unknown sort. Expected one of {list(spec.sort_fields)}, optionally prefixed with '-'."}, 400
+
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    min_depth = request.args.get('min_depth', type=float)
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        return {"message": f"limit must be between 1 and {MAX_PAGE_SIZE}."}, 400
+
+    try:
+        positions, next_cursor, total = index.select(object_type=request.args.get('type'),
+                                                     name=request.args.get('name'), min_depth_pct=min_depth,
+                                                     sort=sort, descending=descending, limit=limit,
+                                                     cursor=request.args.get('cursor'))
+    except ValueError as e:
+        return {"message": str(e)}, 400
+
+    if decorate is None:
+        fragments = index.fragments(positions)
+    else:
+        page_rows = decorate([index.rows[position] for position in positions])
+        fragments = [json.dumps(row, separators=(',', ':')) for row in page_rows]
+    body = (f'{{"{key}":[' + ','.join(fragments) + '],'
+            f'"next_cursor":{json.dumps(next_cursor)},"total":{total}}}')
+    return Response(body, mimetype='application/json')
+
+
 class GetAllQueueManagers(Resource):
+    method_decorators = [requires_login]
+
     def get(self):
-        qmgrs = client.get_all_queue_managers()
-        cache.set('all_qmgrs', qmgrs)
+        return snapshot_response('qmgrs', render_qmgrs)
 
 
-        qmgrs_as_dicts = [qmgr.to_dict() for qmgr in qmgrs]
-        return {'All_Queue_Managers': qmgrs_as_dicts}
+def query_from_args(profiles):
+    """
+    Builds the MQ query for ?profile=full|depth|names (default full) with optional server-side
+    ?name=DEV.* and ?type=local filters. Returns None for an unknown profile.
+    (Full-profile requests with filters are paged from the cached snapshot, see snapshot_page.)
+    """
+    profile = profiles.get(request.args.get('profile', 'full'))
+    if profile is None:
+        return None
+    return profile.with_filters(name=request.args.get('name'), **type_filter_from_args(profile))
 
 
-class GetAllQueues(Resource):
-    def get(self):
-        queues = client.get_all_queues()
-        cache.set('all_queues', queues)
+def type_filter_from_args(profile):
+    # applications have no server-side type filter; GetAllApplications rejects ?type= on its projections
+    object_type = request.args.get('type')
+    if not object_type:
+        return {}
+    if hasattr(profile, 'queue_type'):
+        return {'queue_type': object_type}
+    return {'parameters': {'chltype': object_type}} if profile.qualifier == 'channel' else {}
 
-        queues_as_dicts = []
 
-        for queue in queues:
+def check_queue_thresholds(queues, partial=False):
+    # queues without a depth (e.g. from ?profile=names) are skipped by the evaluator; partial=True for
+    # filtered listings, so queues outside the filter keep their alert state
+    for issue_msg in evaluate_thresholds(queues, queueThresholdManager, partial=partial):
+        log_issue(issue_msg)  # Directly add the issue message to the global issueLog
 
-            if queue.type_name == 'Local' or queue.type_name == 'Transmission':
-                # Checking for custom queue threshold using the manager
-                if queueThresholdManager.contains(queue.queue_name):
-                    currentQueueThreshold = queueThresholdManager.get(queue.queue_name)
-                else:
-                    currentQueueThreshold = queueThresholdManager.defaultThreshold #set to default value of 80%
-                    queueThresholdManager.update({queue.queue_name: currentQueueThreshold})
 
-                issue_msg = queueThresholdManager.thresholdWarning(queue, currentQueueThreshold) #check thresholdWarning
-                if issue_msg:
-                    issue_list.add_issue(issue_msg)  # Directly add the issue message to the global issueLog
+def with_depth_trends(queue_dicts):
+    # copies of the queue dicts with the current depth trend of each queue (None until sampled)
+    trends = depth_history.trends()
+    return [dict(queue_dict, depth_trend=trends.get(queue_dict['queue_name'])) for queue_dict in queue_dicts]
+
+
+class GetAllQueues(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        # ?trends=true attaches each queue's depth_trend; those bodies change every poll, so they are
+        # rendered per request instead of being served from the snapshot's ETag
+        trends = request.args.get('trends', 'false').lower() == 'true'
+        if is_page_request():
+            return snapshot_page('queues', 'All_Queues', QUEUE_INDEX, lambda queue_dicts: queue_dicts,
+                                 with_depth_trends if trends else None)
+
+        query = query_from_args(QUEUE_PROFILES)
+        if query is None:
+            return {"message": f"Unknown profile. Expected one of {list(QUEUE_PROFILES)}."}, 400
+
+        if query.is_full():
+            # served from the background snapshot; projected queries still go to mqweb
+            if trends:
+                return render_queues(with_depth_trends(snapshot_poller.get('queues')))
+            return snapshot_response('queues', render_queues)
+
+        queues = []
+        queues_as_dicts = []
+
+        # streamed: parsed while the queue listing is still downloading
+        for queue in client.iter_all_queues(query=query):
+            queues.append(queue)
             queues_as_dicts.append(queue.to_dict())
+        check_queue_thresholds(queues, partial=True)
 
         # No need to interact with issueCache. Just return the list of queues.
-        return {'All_Queues': queues_as_dicts}
+        return {'All_Queues': with_depth_trends(queues_as_dicts) if trends else queues_as_dicts}
+
+
+class QueueChanges(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        # ?since=<version> from the previous response; omitted or expired versions get a full resync
+        since = request.args.get('since', type=int)
+        snapshot_poller.get('queues')
+        return queue_delta_engine.changes_since(since)
+
+
+class QueueDepthHistory(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        snapshot_poller.get('queues')
+
+        queue_name = request.args.get('queue')
+        if not queue_name:
+            return {'Depth_Trends': depth_history.trends()}
+
+        samples = depth_history.samples(queue_name)
+        if samples is None:
+            return {"message": f"No depth history for queue {queue_name}."}, 404
+        return {'queue_name': queue_name, 'samples': samples, 'depth_trend': depth_history.trend(queue_name)}
 
 
 class GetAllApplications(Resource):
+    method_decorators = [requires_login]
+
     def get(self):
-        applications = client.get_all_applications()
-        cache.set('all_applications', applications)
+        if is_page_request():
+            return snapshot_page('applications', 'All_Applications', APPLICATION_INDEX,
+                                 lambda applications: render_applications(applications)['All_Applications'])
+
+        query = query_from_args(APPLICATION_PROFILES)
+        if query is None:
+            return {"message": f"Unknown profile. Expected one of {list(APPLICATION_PROFILES)}."}, 400
+        if request.args.get('type'):
+            # DISPLAY CONN has no application type filter; the full profile pages ?type= from the snapshot
+            return {"message": "type is only supported with the full profile for applications."}, 400
 
-        apps_as_dicts = [app.to_dict() for app in applications]
-        return {'All_Applications': apps_as_dicts}
+        if query.is_full():
+            return snapshot_response('applications', render_applications)
+
+        applications = client.get_all_applications(query=query)
+        return render_applications(applications)
 
 
 class GetAllChannels(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        if is_page_request():
+            return snapshot_page('channels', 'All_Channels', CHANNEL_INDEX,
+                                 lambda channels: [ch.to_dict() for ch in channels if hasattr(ch, 'to_dict')])
+
+        query = query_from_args(CHANNEL_PROFILES)
+        if query is None:
+            return {"message": f"Unknown profile. Expected one of {list(CHANNEL_PROFILES)}."}, 400
+
+        if query.is_full():
+            return snapshot_response('channels', render_channels)
+
+        channels = client.get_all_channels(query=query)
+        return render_channels(channels)
+
+
+class GetSnapshot(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        # queue manager, queues, channels and applications fetched concurrently in one bundle
+        snapshot = MQRestAPI.AsyncMQ.AsyncClient.from_client(client).get_snapshot_sync()
+        cache_objects('queue', snapshot.queues)
+        cache_objects('channel', snapshot.channels)
+        cache_objects('application', snapshot.applications)
+
+        check_queue_thresholds(snapshot.queues)
+
+        return {'Snapshot': snapshot.to_dict()}
+
+
+############################################################################################################
+#                                           Dependency Graph                                               #
+############################################################################################################
+
+# one graph kept up to date incrementally: queues from the delta engine's net changes since the
+# version last applied, channels and applications by diffing each new snapshot against the last
+# one applied. Both are skipped entirely while their source has not changed.
+dependency_graph = DependencyGraph()
+dependency_graph_sources = (None, None, None)  # queue engine version, channels, applications applied
+dependency_graph_lock = threading.Lock()
+
+GRAPH_NODE_KINDS = (QUEUE, CHANNEL, APPLICATION)
+
+
+def current_dependency_graph():
+    global dependency_graph_sources
+
+    snapshot_poller.get('queues')
+    channels, applications = snapshot_poller.get('channels'), snapshot_poller.get('applications')
+    with dependency_graph_lock:
+        applied_version, applied_channels, applied_applications = dependency_graph_sources
+        if queue_delta_engine.version != applied_version:
+            applied_version, full, upserted, removed = queue_delta_engine.queue_changes_since(applied_version)
+            if full:
+                dependency_graph.sync(QUEUE, client.qmgr, upserted)
+            else:
+                dependency_graph.apply_changes(QUEUE, client.qmgr, upserted, removed)
+        if channels is not applied_channels:
+            dependency_graph.sync(CHANNEL, client.qmgr, channels or [])
+        if applications is not applied_applications:
+            dependency_graph.sync(APPLICATION, client.qmgr, applications or [])
+        dependency_graph_sources = (applied_version, channels, applications)
+        return dependency_graph
+
+
+def clear_dependency_graph():
+    global dependency_graph_sources
+    with dependency_graph_lock:
+        dependency_graph.clear_dependency()
+        dependency_graph_sources = (None, None, None)
+    with dependency_graph_exports_lock:
+        dependency_graph_exports.clear()
+    with graph_clusters_lock:
+        graph_clusters.clear()
+    for dimensions, state in graph_layouts.items():
+        with state['lock']:
+            state['layout'] = GraphLayout(dimensions)
+            state['published'] = None
+
+
+# the whole graph, rendered once per graph version and format
+GRAPH_EXPORT_FORMATS = ('json', 'compact', 'binary')
+dependency_graph_exports = {}  # format -> (graph version, etag, body, mimetype)
+dependency_graph_exports_lock = threading.Lock()
+
+
+def dependency_graph_export(graph, export_format):
+    cached = dependency_graph_exports.get(export_format)
+    if cached is not None and cached[0] == graph.version:
+        return cached
+
+    with dependency_graph_exports_lock:
+        cached = dependency_graph_exports.get(export_format)
+        version = graph.version  # read before rendering, so a concurrent change only causes a re-render
+        if cached is not None and cached[0] == version:
+            return cached
+
+        if export_format == 'binary':
+            body, mimetype = graph.to_binary(), 'application/octet-stream'
+        else:
+            exported = graph.to_compact() if export_format == 'compact' else graph.to_dict()
+            body = json.dumps({'Dependency Graph': exported, 'Version': version}, separators=(',', ':')).encode('utf-8')
+            mimetype = 'application/json'
+        etag = f"graph-{export_format}-{hashlib.blake2b(body, digest_size=12).hexdigest()}"
+        cached = dependency_graph_exports[export_format] = (version, etag, body, mimetype)
+        return cached
+
+
+def graph_node_from_args(graph, prefix=''):
+    # ?kind=queue&name=XMIT.TO.QM2[&qmgr=QM1]; qmgr defaults to the logged in queue manager
+    kind = request.args.get(prefix + 'kind', QUEUE)
+    name = request.args.get(prefix + 'name')
+    if kind not in GRAPH_NODE_KINDS or not name:
+        return None
+    return graph.node_id(kind, request.args.get(prefix + 'qmgr', client.qmgr), name)
+
+
+def reached_as_dicts(reached):
+    return [dict(node.to_dict(), distance=distance) for node, distance in reached]
+
+
+# cluster hierarchies per grouping, kept until the graph, the queue snapshot (the depths) or the open
+# issues move on
+graph_clusters = {}  # grouping -> ((graph version, queue engine version, issue store version), GraphClusters)
+graph_clusters_lock = threading.Lock()
+
+
+def current_graph_clusters(group_by):
+    graph = current_dependency_graph()
+    key = (graph.version, queue_delta_engine.version, issue_store.version)
+    cached = graph_clusters.get(group_by)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with graph_clusters_lock:
+        cached = graph_clusters.get(group_by)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        issue_counts = {}  # (node kind, object name) -> open issues
+        for issue in issue_store.get_issues():
+            # issues name their type as e.g. '<QUEUE>' or 'application'
+            object_key = (str(issue.get('mqobjectType', '')).strip('<>').lower(), issue.get('mqobjectName'))
+            issue_counts[object_key] = issue_counts.get(object_key, 0) + 1
+
+        def tag_of(kind, qmgr_name, name):
+            application = object_index.get('application', name) if qmgr_name == client.qmgr else None
+            return getattr(application, 'appltag', None)
+
+        def metrics(kind, qmgr_name, name):
+            queue = object_index.get('queue', name) if kind == QUEUE and qmgr_name == client.qmgr else None
+            return (getattr(queue, 'current_depth', None), getattr(queue, 'threshold', None),
+                    issue_counts.get((kind, name), 0))
+
+        clusters = GraphClusters(graph.to_compact(), group_by, tag_of, metrics)
+        graph_clusters[group_by] = (key, clusters)
+        return clusters
+
+
+class DependencyClusters(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        # ?group_by=prefix|type|tag [&cluster=<id> to expand, default the root] [&limit=<nodes>]
+        # or &node=<node id> for the chain of cluster ids leading to that node
+        group_by = request.args.get('group_by', 'prefix')
+        if group_by not in GROUPINGS:
+            return {"message": f"Unknown group_by. Expected one of {list(GROUPINGS)}."}, 400
+        clusters = current_graph_clusters(group_by)
+
+        node_id = request.args.get('node')
+        if node_id:
+            chain = clusters.cluster_of(node_id)
+            if chain is None:
+                return {"message": f"{node_id} is not in the dependency graph."}, 404
+            return {'node': node_id, 'clusters': chain, 'version': clusters.version}
+
+        limit = min(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE)
+        view = clusters.view(request.args.get('cluster'), limit)
+        if view is None:
+            return {"message": f"Unknown cluster {request.args.get('cluster')}."}, 404
+        return dict(view, version=clusters.version)
+
+
+# one layout per number of dimensions, each behind its own lock and updated incrementally when the graph
+# version moves on; the body rendered by the last update is published so that reads of an unchanged
+# graph never wait on the lock
+graph_layouts = {dimensions: {'layout': GraphLayout(dimensions), 'published': None,  # (version, etag, body)
+                              'lock': threading.Lock(), 'relayout_lock': threading.Lock()}
+                 for dimensions in GRID_CELLS}
+
+
+def publish_graph_layout(state, layout):
+    body = json.dumps({'Layout': layout.to_dict()}, separators=(',', ':')).encode('utf-8')
+    etag = f"layout-{layout.dimensions}-{hashlib.blake2b(body, digest_size=12).hexdigest()}"
+    state['layout'] = layout
+    state['published'] = (layout.version, etag, body)
+    return state['published']
+
+
+def current_graph_layout(dimensions):
+    graph = current_dependency_graph()
+    state = graph_layouts[dimensions]
+    published = state['published']
+    if published is not None and published[0] == graph.version:
+        return published
+
+    with state['lock']:
+        published = state['published']
+        if published is not None and published[0] == graph.version:
+            return published
+        layout = state['layout']
+        layout.update(graph.to_compact())
+        return publish_graph_layout(state, layout)
+
+
+def relayout_graph(dimensions):
+    """
+    Lays the whole graph out afresh and publishes it in place of the current layout; None if a
+    relayout of these dimensions is already running. The full simulation runs without holding
+    the layout lock, so layout reads carry on with the current coordinates meanwhile.
+    """
+    state = graph_layouts[dimensions]
+    if not state['relayout_lock'].acquire(blocking=False):
+        return None
+    try:
+        graph = current_dependency_graph()
+        layout = GraphLayout(dimensions)
+        layout.update(graph.to_compact())
+        with state['lock']:
+            if layout.version != graph.version:  # the graph moved on during the relayout
+                layout.update(graph.to_compact())
+            return publish_graph_layout(state, layout)
+    finally:
+        state['relayout_lock'].release()
+
+
+def graph_layout_response(version, etag, body):
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Graph-Version'] = str(version)
+    return response
+
+
+class DependencyGraphLayout(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        # ?dimensions=2|3
+        dimensions = request.args.get('dimensions', 2, type=int)
+        if dimensions not in GRID_CELLS:
+            return {"message": f"Unsupported dimensions. Expected one of {list(GRID_CELLS)}."}, 400
+        return graph_layout_response(*current_graph_layout(dimensions))
+
+    def post(self):
+        # {"dimensions": 2} to lay everything out afresh, replacing the coordinates every client is using
+        data = request.get_json(force=True, silent=True) or {}
+        dimensions = data.get('dimensions', 2) if isinstance(data, dict) else None
+        if dimensions not in GRID_CELLS:
+            return {"message": f"Unsupported dimensions. Expected one of {list(GRID_CELLS)}."}, 400
+
+        published = relayout_graph(dimensions)
+        if published is None:
+            return {"message": f"A relayout in {dimensions} dimensions is already running."}, 409
+        return graph_layout_response(*published)
+
+
+class GetDependencyGraph(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        # ?format=json (default, the nested dict) | compact (string table + offset arrays) | binary
+        export_format = request.args.get('format', 'json')
+        if export_format not in GRAPH_EXPORT_FORMATS:
+            return {"message": f"Unknown format. Expected one of {list(GRAPH_EXPORT_FORMATS)}."}, 400
+
+        version, etag, body, mimetype = dependency_graph_export(current_dependency_graph(), export_format)
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype=mimetype)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Graph-Version'] = str(version)
+        return response
+
+
+class DependencyImpact(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        graph = current_dependency_graph()
+        node_id = graph_node_from_args(graph)
+        if node_id is None:
+            return {"message": f"Expecting ?name= and an optional ?kind= (one of {list(GRAPH_NODE_KINDS)}) and ?qmgr=."}, 400
+
+        impacted = graph.upstream(node_id, request.args.get('depth', type=int))
+        if impacted is None:
+            return {"message": f"{node_id} is not in the dependency graph."}, 404
+        return {'node': node_id, 'impacted': reached_as_dicts(impacted), 'count': len(impacted)}
+
+
+class DependencyDependencies(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        graph = current_dependency_graph()
+        node_id = graph_node_from_args(graph)
+        if node_id is None:
+            return {"message": f"Expecting ?name= and an optional ?kind= (one of {list(GRAPH_NODE_KINDS)}) and ?qmgr=."}, 400
+
+        dependencies = graph.downstream(node_id, request.args.get('depth', type=int))
+        if dependencies is None:
+            return {"message": f"{node_id} is not in the dependency graph."}, 404
+        return {'node': node_id, 'dependencies': reached_as_dicts(dependencies), 'count': len(dependencies)}
+
+
+class DependencyPath(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        # ?from_kind=&from_name=&from_qmgr=&to_kind=&to_name=&to_qmgr=
+        graph = current_dependency_graph()
+        source, target = graph_node_from_args(graph, 'from_'), graph_node_from_args(graph, 'to_')
+        if source is None or target is None:
+            return {"message": "Expecting ?from_name= and ?to_name=, with optional _kind= and _qmgr= for each."}, 400
+
+        chain = graph.path(source, target)
+        return {'from': source, 'to': target,
+                'path': None if chain is None else [dict(node.to_dict(), edge=edge) for node, edge in chain]}
+
+
+############################################################################################################
+#                                        Multiple Queue Managers                                           #
+############################################################################################################
+
+class QueueManagerClients(Resource):
+
+    def get(self):
+        return {'Queue_Managers': client_registry.qmgr_names()}
+
+    def post(self):
+        data = request.get_json()
+
+        required_fields = ["qmgr", "address", "username", "password", "admin_port"]
+        if not data or not all(field in data and data[field] not in [None, ""] for field in required_fields):
+            return {"message": "Missing or invalid required fields. Ensure all fields provided and not empty."}
+
+        url = "https://" + data["address"] + ":" + data["admin_port"]
+        try:
+            client_registry.login(url=url, qmgr=data["qmgr"], username=data["username"], password=data["password"])
+        except Exception as e:
+            if "timed out" in str(e):
+                return {"message": "Connection timeout; check Address and Admin Port"}
+            return {"message": f"Login failed, incorrect login details. Check Username and Password "}
+
+        clear_network_graph()
+        return {"message": f"Queue manager {data['qmgr']} registered."}
+
+    def delete(self):
+        qmgr_name = request.args.get('qmgr')
+        if not qmgr_name or not client_registry.remove(qmgr_name):
+            return {"message": "Unknown queue manager."}
+        clear_network_graph()
+        return {"message": f"Queue manager {qmgr_name} removed."}
+
+
+class FanOutObjects(Resource):
+    def get(self, object_type):
+        if object_type not in FanOutCollector.OBJECT_TYPES:
+            return {"message": f"Unknown object type. Expected one of {list(FanOutCollector.OBJECT_TYPES)}."}, 404
+
+        # optional ?qmgr=QM1&qmgr=QM2 to restrict the fan-out
+        qmgrs = request.args.getlist('qmgr') or None
+        results, errors = fan_out_collector.collect([object_type], qmgrs)
+
+        by_qmgr = {qmgr_name: [obj.to_dict() for obj in objects[object_type]]
+                   for qmgr_name, objects in results.items()}
+        return {'By_Queue_Manager': by_qmgr, 'Errors': errors}
+
+
+class FanOutObjectsMerged(Resource):
+    def get(self, object_type):
+        if object_type not in FanOutCollector.OBJECT_TYPES:
+            return {"message": f"Unknown object type. Expected one of {list(FanOutCollector.OBJECT_TYPES)}."}, 404
+
+        qmgrs = request.args.getlist('qmgr') or None
+        results, errors = fan_out_collector.collect([object_type], qmgrs)
+
+        return {'Merged': FanOutCollector.merge(results, object_type), 'Errors': errors}
+
+
+# the dependency graph across every registered queue manager, rebuilt at most every NETWORK_GRAPH_TTL
+# seconds (or on ?refresh=true) since a build fetches everything from every queue manager
+NETWORK_GRAPH_TTL = 30
+network_graph = None  # (graph, errors, time.monotonic() when built)
+network_graph_lock = threading.Lock()
+
+
+def current_network_graph(refresh=False):
+    global network_graph
+    with network_graph_lock:
+        if refresh or network_graph is None or time.monotonic() - network_graph[2] >= NETWORK_GRAPH_TTL:
+            graph, errors = build_network_graph(fan_out_collector)
+            network_graph = (graph, errors, time.monotonic())
+        return network_graph[0], network_graph[1]
+
+
+def clear_network_graph():
+    global network_graph
+    with network_graph_lock:
+        network_graph = None
+
+
+class NetworkImpact(Resource):
+    method_decorators = [requires_login]
+
     def get(self):
-        channels = client.get_all_channels()
-        cache.set('all_channels', channels)
+        # ?kind=&name=&qmgr=, as /dependencygraph/impact, across all registered queue managers
+        graph, errors = current_network_graph(request.args.get('refresh', 'false').lower() == 'true')
+        node_id = graph_node_from_args(graph)
+        if node_id is None:
+            return {"message": f"Expecting ?name= and an optional ?kind= (one of {list(GRAPH_NODE_KINDS)}) and ?qmgr=."}, 400
 
-        chs_as_dicts = [ch.to_dict() if hasattr(ch, 'to_dict') else 'Not a channel instance' for ch in channels]
-        return {'All_Channels': chs_as_dicts}
+        impacted = graph.upstream(node_id, request.args.get('depth', type=int))
+        if impacted is None:
+            return {"message": f"{node_id} is not in the network graph.", 'Errors': errors}, 404
+        return {'node': node_id, 'impacted': reached_as_dicts(impacted), 'count': len(impacted), 'Errors': errors}
 
 
+class NetworkRoute(Resource):
+    method_decorators = [requires_login]
+
+    def get(self):
+        # ?name=REMOTE.Q&qmgr=QM1: the hops a message put to that queue takes across queue managers
+        graph, errors = current_network_graph(request.args.get('refresh', 'false').lower() == 'true')
+        name = request.args.get('name')
+        if not name:
+            return {"message": "Expecting ?name= and an optional ?qmgr=."}, 400
+
+        node_id = graph.node_id(QUEUE, request.args.get('qmgr', client.qmgr), name)
+        route = graph.message_route(node_id)
+        if route is None:
+            return {"message": f"{node_id} is not in the network graph.", 'Errors': errors}, 404
+        return {'queue': node_id, 'route': [dict(node.to_dict(), edge=edge) for node, edge in route], 'Errors': errors}
 
 
 ############################################################################################################
@@ -533,11 +1403,31 @@ class GetAllChannels(Resource):
 api.add_resource(ClientConfig, '/clientconfig')
 api.add_resource(GetAllQueueManagers, '/getallqueuemanagers')
 api.add_resource(GetAllQueues, '/getallqueues')
+api.add_resource(QueueChanges, '/changes')
+api.add_resource(QueueDepthHistory, '/queuedepthhistory')
 api.add_resource(GetAllApplications, '/getallapplications')
 api.add_resource(GetAllChannels, '/getallchannels')
+api.add_resource(GetSnapshot, '/getsnapshot')
+api.add_resource(GetDependencyGraph, '/getdependencygraph')
+api.add_resource(DependencyImpact, '/dependencygraph/impact')
+api.add_resource(DependencyDependencies, '/dependencygraph/dependencies')
+api.add_resource(DependencyPath, '/dependencygraph/path')
+api.add_resource(DependencyClusters, '/dependencygraph/clusters')
+api.add_resource(DependencyGraphLayout, '/dependencygraph/layout')
+api.add_resource(PollerConfig, '/pollerconfig')
+api.add_resource(QueueManagerClients, '/qmgrclients')
+api.add_resource(FanOutObjects, '/fanout/<string:object_type>')
+api.add_resource(FanOutObjectsMerged, '/fanout/<string:object_type>/merged')
+api.add_resource(NetworkImpact, '/network/impact')
+api.add_resource(NetworkRoute, '/network/route')
 api.add_resource(ChatBotQuery, '/chatbotquery')
 api.add_resource(QueueThresholdConfig, '/queuethresholdmanager')
+api.add_resource(AlertingConfig, '/alertingconfig')
 api.add_resource(IssueListResource, '/issues')
+api.add_resource(IssuePoll, '/issues/poll')
+api.add_resource(IssueStream, '/issuestream')
+api.add_resource(IssueHistoryResource, '/issuehistory')
+api.add_resource(IssuesOverTime, '/issuesovertime')
 api.add_resource(Logout, "/logout")
 api.add_resource(ResolveIssue, '/resolve', '/check')
 api.add_resource(JavaLoginFeedback, '/javaloginfeedback')
@@ -0,0 +1,122 @@
+# Per-queue alert state machines for the threshold checks.
+#
+# Each queue is OK, EXCEEDED or FULL. Alerts are raised on state changes rather than on every
+# poll that sees a queue above its threshold:
+#   - OK -> EXCEEDED when the depth reaches the threshold, -> FULL when the queue is full;
+#     entering a higher state alerts.
+#   - Hysteresis: an EXCEEDED / FULL queue only returns to OK once its depth falls below
+#     threshold - clear_margin, so a queue hovering around the threshold does not flap.
+#   - A queue that stays in an alerting state is re-alerted every reminder_interval seconds
+#     (None: never), however often it is polled.
+#   - The same alert is never raised for a queue more than once per min_alert_interval.
+
+import time
+from threading import Lock
+
+OK, EXCEEDED, FULL = 0, 1, 2
+
+
+class _AlertState:
+    __slots__ = ('level', 'alerted_at')
+
+    def __init__(self):
+        self.level = OK
+        self.alerted_at = {}  # level -> time.monotonic() of its last alert
+
+
+class QueueAlertStates:
+    def __init__(self, clear_margin=5, min_alert_interval=60, reminder_interval=300):
+        self.clear_margin = clear_margin  # percentage points below the threshold to clear
+        self.min_alert_interval = min_alert_interval
+        self.reminder_interval = reminder_interval
+        self._states = {}  # queue name -> _AlertState, for queues not OK or recently alerted
+        self._lock = Lock()
+
+    def configure(self, clear_margin=None, min_alert_interval=None, reminder_interval=None, no_reminders=False):
+        with self._lock:
+            if clear_margin is not None:
+                self.clear_margin = clear_margin
+            if min_alert_interval is not None:
+                self.min_alert_interval = min_alert_interval
+            if reminder_interval is not None or no_reminders:
+                self.reminder_interval = reminder_interval
+
+    def settings(self):
+        return {
+            'clear_margin': self.clear_margin,
+            'min_alert_interval': self.min_alert_interval,
+            'reminder_interval': self.reminder_interval
+        }
+
+    def _enter(self, state, level, now):
+        # moves the state machine to `level`; returns True if that should raise an alert
+        escalated = level > state.level
+        last_alert = state.alerted_at.get(level)
+        if last_alert is not None and now - last_alert < self.min_alert_interval:
+            if not escalated:
+                state.level = level
+            return False  # a suppressed escalation is retried with the next snapshot
+
+        state.level = level
+        if escalated or (self.reminder_interval is not None and last_alert is not None
+                         and now - last_alert >= self.reminder_interval):
+            state.alerted_at[level] = now
+            return True
+        return False
+
+    def update(self, names, percentages, thresholds, full, breaching, now=None, partial=False):
+        """
+        Advances the state machines with one snapshot (the columns of a DepthTable plus the
+        result of find_breaches) and returns [(row index, FULL or EXCEEDED), ...] for the
+        alerts to raise, in snapshot order. A partial snapshot (e.g. a filtered listing) only
+        advances the queues in it; tracked queues missing from it are left as they are instead
+        of being treated as gone.
+        """
+        now = time.monotonic() if now is None else now
+        alerts = []
+
+        with self._lock:
+            states = self._states
+            breaching_names = set()
+            for index in breaching:
+                name = names[index]
+                breaching_names.add(name)
+                state = states.get(name)
+                if state is None:
+                    state = states[name] = _AlertState()
+                level = FULL if full[index] else EXCEEDED
+                if self._enter(state, level, now):
+                    alerts.append((int(index), level))
+
+            # tracked queues below their threshold: held by the hysteresis band, or back to OK
+            others = [name for name in states if name not in breaching_names]
+            if others:
+                index_of = {name: index for index, name in enumerate(names)}
+                for name in others:
+                    index = index_of.get(name)
+                    if index is None and partial:
+                        continue
+                    state = states[name]
+                    if index is not None and state.level != OK and \
+                            percentages[index] >= thresholds[index] - self.clear_margin:
+                        if self._enter(state, EXCEEDED, now):
+                            alerts.append((index, EXCEEDED))
+                        continue
+
+                    state.level = OK
+                    # forget the queue once it is gone, or once min_alert_interval no longer applies
+                    if index is None or all(now - alerted_at >= self.min_alert_interval
+                                            for alerted_at in state.alerted_at.values()):
+                        del states[name]
+
+        alerts.sort()
+        return alerts
+
+    def states(self):
+        names = {OK: 'OK', EXCEEDED: 'EXCEEDED', FULL: 'FULL'}
+        with self._lock:
+            return {name: names[state.level] for name, state in self._states.items() if state.level != OK}
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
@@ -0,0 +1,152 @@
+# Durable issue history in SQLite.
+#
+# Open issues live in memory and are dropped on logout, restart or a GET /issues; the history
+# keeps one row per opened issue for as long as the database file exists. Recording never
+# touches the database on the caller's thread: issues are put on an in-memory queue, and a
+# writer thread inserts whatever has accumulated in one transaction per batch, so request
+# handlers pay for a queue put and nothing else.
+#
+# Rows are indexed by (object name, time), (issue code, time) and time, which is what the
+# range queries behind the "issues over time" endpoint filter on.
+
+import json
+import queue
+import threading
+import time
+
+from sqlalchemy import (Column, Float, Index, Integer, MetaData, String, Table, Text, cast, create_engine, event,
+                        func, insert, select)
+
+metadata = MetaData()
+
+issue_history = Table(
+    'issue_history', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('recorded_at', Float, nullable=False),  # unix timestamp
+    Column('mqobject_type', String(64)),
+    Column('mqobject_name', String(256)),
+    Column('issue_code', String(64)),
+    Column('start_timestamp', String(32)),
+    Column('issue', Text),  # the issue as JSON
+    Index('ix_issue_history_object_time', 'mqobject_name', 'recorded_at'),
+    Index('ix_issue_history_code_time', 'issue_code', 'recorded_at'),
+    Index('ix_issue_history_time', 'recorded_at')
+)
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets the range queries read while the writer thread inserts
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+class IssueHistory:
+    def __init__(self, url='sqlite:///issue_history.db', batch_size=500, flush_interval=1.0, max_pending=100000):
+        self.engine = create_engine(url)
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine, 'connect', _sqlite_pragmas)
+        metadata.create_all(self.engine)
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0  # issues not recorded because the writer fell max_pending behind
+        self.last_error = None
+
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._stopped = threading.Event()
+        self._writer = threading.Thread(target=self._run, name='issue-history-writer', daemon=True)
+        self._writer.start()
+
+    def record(self, issue):
+        """
+        Queues `issue` for the next batch; never blocks.
+        """
+        try:
+            self._pending.put_nowait((time.time(), issue))
+        except queue.Full:
+            self.dropped += 1
+
+    def _take_batch(self, timeout):
+        try:
+            batch = [self._pending.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        rows = [{
+            'recorded_at': recorded_at,
+            'mqobject_type': issue.get('mqobjectType'),
+            'mqobject_name': issue.get('mqobjectName'),
+            'issue_code': issue.get('issueCode'),
+            'start_timestamp': issue.get('startTimeStamp'),
+            'issue': json.dumps(issue, default=str)
+        } for recorded_at, issue in batch]
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(insert(issue_history), rows)
+        except Exception as e:
+            self.last_error = str(e)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._take_batch(self.flush_interval)
+            if batch:
+                self._write(batch)
+        # drain what is left on shutdown
+        while True:
+            batch = self._take_batch(0)
+            if not batch:
+                break
+            self._write(batch)
+
+    def close(self, timeout=5):
+        self._stopped.set()
+        self._writer.join(timeout)
+
+    @staticmethod
+    def _filtered(statement, start, end, mqobject_name, issue_code):
+        statement = statement.where(issue_history.c.recorded_at >= start, issue_history.c.recorded_at < end)
+        if mqobject_name:
+            statement = statement.where(issue_history.c.mqobject_name == mqobject_name)
+        if issue_code:
+            statement = statement.where(issue_history.c.issue_code == issue_code)
+        return statement
+
+    def issues(self, start, end, mqobject_name=None, issue_code=None, limit=1000):
+        """
+        Recorded issues with start <= recorded_at < end (unix timestamps), newest first.
+        """
+        statement = self._filtered(select(issue_history.c.recorded_at, issue_history.c.issue), start, end,
+                                   mqobject_name, issue_code)
+        statement = statement.order_by(issue_history.c.recorded_at.desc()).limit(limit)
+        with self.engine.connect() as connection:
+            return [dict(json.loads(row.issue), recordedAt=row.recorded_at) for row in connection.execute(statement)]
+
+    def counts_over_time(self, start, end, bucket_seconds, mqobject_name=None, issue_code=None):
+        """
+        Number of issues per issue code in each `bucket_seconds` wide bucket of [start, end):
+        [{'bucket_start': unix timestamp, 'counts': {issue code: count}}, ...], oldest first.
+        """
+        bucket = cast((issue_history.c.recorded_at - start) / bucket_seconds, Integer).label('bucket')
+        statement = self._filtered(select(bucket, issue_history.c.issue_code, func.count().label('count')), start,
+                                   end, mqobject_name, issue_code)
+        statement = statement.group_by(bucket, issue_history.c.issue_code).order_by(bucket)
+
+        buckets = {}
+        with self.engine.connect() as connection:
+            for row in connection.execute(statement):
+                counts = buckets.setdefault(row.bucket, {})
+                counts[row.issue_code] = row.count
+        return [{'bucket_start': start + index * bucket_seconds, 'counts': counts}
+                for index, counts in buckets.items()]
+
+    def status(self):
+        return {'pending': self._pending.qsize(), 'dropped': self.dropped, 'last_error': self.last_error}
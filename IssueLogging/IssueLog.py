@@ -0,0 +1,69 @@
+# Sequence-numbered, append-only issue log for push delivery.
+#
+# Every issue gets the next sequence number and is kept in a bounded ring. Consumers keep their
+# own cursor (the last sequence number they saw) and read everything after it, so any number of
+# dashboards can follow the same log independently - unlike GET /issues, which hands the list to
+# whoever asks first and then clears it. Readers block on a condition variable until something
+# newer than their cursor arrives, so following the log costs nothing while it is quiet.
+
+import threading
+from collections import deque
+from itertools import islice
+
+
+class IssueLog:
+    def __init__(self, capacity=10000):
+        self._entries = deque(maxlen=capacity)  # (sequence number, issue), oldest first
+        self._last_seq = 0  # never reset, so cursors handed out before clear() stay meaningful
+        self._condition = threading.Condition()
+
+    @property
+    def last_seq(self):
+        with self._condition:
+            return self._last_seq
+
+    def append(self, issue):
+        with self._condition:
+            self._last_seq += 1
+            self._entries.append((self._last_seq, issue))
+            self._condition.notify_all()
+            return self._last_seq
+
+    def _read(self, cursor, limit):
+        # returns (entries after cursor, new cursor, missed); missed is True when entries after
+        # the cursor were already evicted, or the cursor comes from before a server restart
+        first_seq = self._entries[0][0] if self._entries else self._last_seq + 1
+        if cursor is None:
+            cursor, missed = first_seq - 1, False
+        elif cursor > self._last_seq:
+            cursor, missed = first_seq - 1, True
+        elif cursor < first_seq - 1:
+            cursor, missed = first_seq - 1, True
+        else:
+            missed = False
+
+        # sequence numbers are contiguous, so the position after the cursor is known directly
+        entries = list(islice(self._entries, cursor - first_seq + 1, None))
+        if limit is not None:
+            entries = entries[:limit]
+        return entries, (entries[-1][0] if entries else cursor), missed
+
+    def read(self, cursor, limit=None):
+        """
+        Entries with a sequence number above `cursor` (None = from the oldest retained entry).
+        Returns ([(seq, issue), ...], cursor to pass next time, missed).
+        """
+        with self._condition:
+            return self._read(cursor, limit)
+
+    def wait(self, cursor, timeout, limit=None):
+        """
+        Same as read(), but blocks up to `timeout` seconds until there is something after `cursor`.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: cursor is None or self._last_seq != cursor, timeout)
+            return self._read(cursor, limit)
+
+    def clear(self):
+        with self._condition:
+            self._entries.clear()
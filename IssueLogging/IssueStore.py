@@ -0,0 +1,147 @@
+# Keyed, coalescing store of open issues.
+#
+# An issue is identified by (mqobjectName, issueCode). A queue that stays full raises the same
+# Queue_Full issue on every poll; instead of appending a fresh copy each time, the store keeps
+# one entry per key holding the latest occurrence plus firstSeen / lastSeen / count. The number
+# of entries is capped, evicting the least recently seen issue first, so memory stays bounded
+# however many objects misbehave.
+#
+# An entry stays open until it is resolved, or until no occurrence has been seen for stale_after
+# seconds; only then does a further occurrence open a new entry (and reach the issue log and
+# history). GET /issues hands out each open entry once via deliver(), which marks it delivered
+# rather than forgetting it, so a condition that persists is not reported again on every fetch.
+#
+# Resolutions are kept by key as well, with an expiry: resolving drops the open entry and
+# suppresses new occurrences of that key until it expires, so nothing has to scan the issues.
+
+import datetime
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+def issue_key(issue):
+    return issue.get('mqobjectName'), issue.get('issueCode')
+
+
+class IssueStore:
+    def __init__(self, max_issues=5000, stale_after=900):
+        self.max_issues = max_issues
+        self.stale_after = stale_after  # seconds without an occurrence before an entry closes by itself
+        self.evicted = 0  # issues dropped to stay under max_issues
+        self._version = 0  # bumped whenever an entry opens or closes
+        self._issues = OrderedDict()  # key -> latest issue, least recently seen first
+        self._seen_at = {}  # key -> time.monotonic() of the latest occurrence
+        self._delivered = set()  # keys of open entries already handed out by deliver()
+        self._resolved = {}  # key -> time.monotonic() when the resolution expires
+        self._lock = Lock()
+
+    def add(self, issue):
+        """
+        Coalesces `issue` into the entry for its key. Returns the stored issue if it opened a new
+        entry, None if it only updated an open one or its key is resolved.
+        """
+        key = issue_key(issue)
+        now = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S')  # ISO 8601 format, as the issue timestamps
+
+        with self._lock:
+            if self._is_resolved(key):
+                return None
+
+            self._expire()
+            existing = self._issues.pop(key, None)
+            if existing is None:
+                stored = dict(issue, firstSeen=now, lastSeen=now, count=1)
+            else:
+                stored = dict(issue, firstSeen=existing['firstSeen'], lastSeen=now, count=existing['count'] + 1)
+            self._issues[key] = stored  # (re)inserted last: most recently seen
+            self._seen_at[key] = time.monotonic()
+            if existing is None:
+                self._version += 1
+
+            while len(self._issues) > self.max_issues:
+                self._forget(next(iter(self._issues)))
+                self.evicted += 1
+            return stored if existing is None else None
+
+    def _forget(self, key):
+        if self._issues.pop(key, None) is not None:
+            self._version += 1
+        self._seen_at.pop(key, None)
+        self._delivered.discard(key)
+
+    def _expire(self):
+        # entries are ordered by their latest occurrence, so the stale ones are at the front
+        stale_before = time.monotonic() - self.stale_after
+        while self._issues:
+            key = next(iter(self._issues))
+            if self._seen_at[key] > stale_before:
+                break
+            self._forget(key)
+
+    @property
+    def version(self):
+        """
+        Changes whenever the set of open entries does, for caches derived from it.
+        """
+        with self._lock:
+            self._expire()
+            return self._version
+
+    def get_issues(self):
+        with self._lock:
+            self._expire()
+            return list(self._issues.values())
+
+    def deliver(self):
+        """
+        Returns the open issues not handed out by an earlier call and marks them delivered.
+        They stay open, so their later occurrences are still coalesced instead of reopening them.
+        """
+        with self._lock:
+            self._expire()
+            issues = [issue for key, issue in self._issues.items() if key not in self._delivered]
+            self._delivered.update(self._issues)
+            return issues
+
+    def _is_resolved(self, key):
+        expires = self._resolved.get(key)
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            del self._resolved[key]
+            return False
+        return True
+
+    def is_resolved(self, mqobject_name, issue_code):
+        with self._lock:
+            return self._is_resolved((mqobject_name, issue_code))
+
+    def resolve(self, mqobject_name, issue_code, timeout=60):
+        """
+        Closes the issue and ignores new occurrences of it for `timeout` seconds.
+        """
+        key = (mqobject_name, issue_code)
+        with self._lock:
+            self._forget(key)
+            if len(self._resolved) >= self.max_issues:
+                now = time.monotonic()
+                self._resolved = {resolved_key: expires for resolved_key, expires in self._resolved.items()
+                                  if expires > now}
+            self._resolved[key] = time.monotonic() + timeout
+
+    def clear_resolved(self):
+        with self._lock:
+            self._resolved.clear()
+
+    def clear(self):
+        with self._lock:
+            self._issues.clear()
+            self._version += 1
+            self._seen_at.clear()
+            self._delivered.clear()
+            self._resolved.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._issues)
@@ -1,32 +1,131 @@
 from threading import Lock
+from types import MappingProxyType
 import datetime
+from IssueLogging.AlertStates import QueueAlertStates
+
+_RULE = ''  # trie node key holding the threshold of the prefix that ends at that node
+
+
+class ThresholdMatcher:
+    """
+    Compiled threshold rules. A rule is an exact queue name or, as in MQ generic names, a prefix
+    ending in '*' ("DEV.*", "XMIT.TO.*", "*" for every queue). An exact rule wins, then the
+    longest matching prefix, then the default. Prefix rules live in a character trie, so a
+    lookup is one walk down the queue name, and results are cached per queue name (concurrent
+    lookups may both fill the same cache entry, with the same value).
+    """
+
+    def __init__(self, rules, default):
+        self.default = default
+        self._exact = {}
+        self._trie = {}
+        for rule, threshold in rules.items():
+            if rule.endswith('*'):
+                node = self._trie
+                for char in rule[:-1]:
+                    node = node.setdefault(char, {})
+                node[_RULE] = threshold
+            else:
+                self._exact[rule] = threshold
+        self._cache = {}
+
+    def match(self, queue_name):
+        threshold = self._cache.get(queue_name)
+        if threshold is not None:
+            return threshold
+
+        threshold = self._exact.get(queue_name)
+        if threshold is None:
+            node = self._trie
+            threshold = node.get(_RULE, self.default)
+            for char in queue_name:
+                node = node.get(char)
+                if node is None:
+                    break
+                threshold = node.get(_RULE, threshold)
+
+        self._cache[queue_name] = threshold
+        return threshold
+
+
+class ThresholdSnapshot:
+    """
+    Immutable, versioned threshold configuration: the rules plus their compiled matcher.
+    """
+    __slots__ = ('version', 'rules', 'default', 'matcher')
+
+    def __init__(self, version, rules, default):
+        self.version = version
+        self.rules = MappingProxyType(rules)  # read-only view, the dict itself is never changed again
+        self.default = default
+        self.matcher = ThresholdMatcher(rules, default)
+
 
 class QueueThresholdManager:
+    # Copy-on-write: every update builds a new ThresholdSnapshot and swaps it in with a single
+    # assignment. Readers take the current snapshot without locking and keep a consistent view
+    # of it for as long as they hold it; _lock only serialises writers.
     def __init__(self):
-        self._thresholds = {}
         self.defaultThreshold = 80 #(%)
         self._lock = Lock()
+        self._snapshot = ThresholdSnapshot(0, {}, self.defaultThreshold)  # rules: queue name or prefix* -> threshold
+        # hysteresis / re-alert state per queue, used by the snapshot threshold checks
+        self.alert_states = QueueAlertStates()
+
+    def snapshot(self):
+        return self._snapshot
 
     def update(self, new_thresholds):
         with self._lock:
-            self._thresholds.update(new_thresholds)
+            current = self._snapshot
+            rules = dict(current.rules)
+            rules.update(new_thresholds)
+            self._snapshot = ThresholdSnapshot(current.version + 1, rules, self.defaultThreshold)
 
     def get(self, queue_name, default=None):
-        with self._lock:
-            return self._thresholds.get(queue_name, default)
+        return self._snapshot.rules.get(queue_name, default)
 
     def contains(self, queue_name):
-        with self._lock:
-            return queue_name in self._thresholds
+        return queue_name in self._snapshot.rules
+
+    def resolve_thresholds(self, queue_names):
+        """
+        Thresholds for many queues from one snapshot, through its compiled rules.
+        Queues no rule matches get the default; nothing is recorded for them.
+        """
+        match = self._snapshot.matcher.match
+        return [match(queue_name) for queue_name in queue_names]
 
     def clear_thresholds(self):
         with self._lock:
-            self._thresholds.clear()
+            self._snapshot = ThresholdSnapshot(self._snapshot.version + 1, {}, self.defaultThreshold)
+        self.alert_states.clear()
 
 
     def thresholdWarning(self, queue, thresholdLimit):
+        if queue.current_depth == queue.max_number_of_messages:
+            return self.queue_full_alert(queue, thresholdLimit)
+        elif queue.threshold >= thresholdLimit:
+            return self.threshold_exceeded_alert(queue, thresholdLimit)
+        else:
+            return None
+
+    def queue_full_alert(self, queue, thresholdLimit):
+        alert_template = self._alert_template(queue, thresholdLimit)
+        alert_template["issueCode"] = "Queue_Full"
+        alert_template["generalDesc"] = "The queue is 100% full. Immediate action required!"
+        return alert_template
+
+    def threshold_exceeded_alert(self, queue, thresholdLimit):
+        alert_template = self._alert_template(queue, thresholdLimit)
+        alert_template["issueCode"] = "Threshold_Exceeded"
+        alert_template[
+            "generalDesc"] = f"The queue has exceeded the {thresholdLimit}% threshold limit. Please take necessary actions to avoid potential issues."
+        return alert_template
+
+    def _alert_template(self, queue, thresholdLimit):
         current_time = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S')  # ISO 8601 format
-        alert_template = {
+        return {
             "issueCode": "",
             "startTimeStamp": current_time,
             "generalDesc": "",
@@ -37,20 +136,3 @@ class QueueThresholdManager:
             "mqobjectName": queue.queue_name,
             "objectDetails": str(queue)
         }
-
-        if queue.current_depth == queue.max_number_of_messages:
-            alert_template["issueCode"] = "Queue_Full"
-            alert_template["generalDesc"] = "The queue is 100% full. Immediate action required!"
-        elif queue.threshold >= thresholdLimit:
-            alert_template["issueCode"] = "Threshold_Exceeded"
-            alert_template[
-                "generalDesc"] = f"The queue has exceeded the {thresholdLimit}% threshold limit. Please take necessary actions to avoid potential issues."
-        else:
-            return None
-
-        return alert_template
-
-
-
-
-
@@ -0,0 +1,76 @@
+# Vectorised queue threshold evaluation.
+#
+# Instead of checking queues one by one (three threshold-manager lock round-trips and an alert
+# dict per queue), a snapshot is laid out as columns - current depth, max depth and threshold
+# per queue - and every Queue_Full / Threshold_Exceeded queue is found in a single NumPy pass.
+# The per-queue alert state machines (AlertStates) then decide which of those breaches are
+# worth an alert, and alert dicts are built only for them.
+
+import numpy as np
+from IssueLogging.AlertStates import FULL
+
+DEPTH_QUEUE_TYPES = ('Local', 'Transmission')
+
+
+class DepthTable:
+    """
+    Columnar snapshot of the local and transmission queues that report a depth.
+    """
+
+    def __init__(self, queues):
+        self.queues = [queue for queue in queues
+                       if queue.type_name in DEPTH_QUEUE_TYPES
+                       and queue.current_depth is not None and queue.max_number_of_messages]
+        count = len(self.queues)
+        self.names = [queue.queue_name for queue in self.queues]
+        self.current_depth = np.fromiter((queue.current_depth for queue in self.queues), dtype=np.int64, count=count)
+        self.max_depth = np.fromiter((queue.max_number_of_messages for queue in self.queues), dtype=np.int64,
+                                     count=count)
+        self.threshold = np.zeros(count, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.queues)
+
+    def set_thresholds(self, thresholds):
+        self.threshold = np.asarray(thresholds, dtype=np.float64)
+
+    def depth_percentage(self):
+        # same arithmetic as Parser: (current_depth / max_number_of_messages) * 100
+        return (self.current_depth / self.max_depth) * 100
+
+
+def find_breaches(table):
+    """
+    Returns (boolean mask of full queues, indices of all breaching queues in snapshot order).
+    A full queue is reported as Queue_Full only, never also as Threshold_Exceeded.
+    """
+    full = table.current_depth == table.max_depth
+    exceeded = table.depth_percentage() >= table.threshold
+    return full, np.flatnonzero(full | exceeded)
+
+
+def evaluate_thresholds(queues, threshold_manager, now=None, partial=False):
+    """
+    Returns the alert dicts due for `queues`, using the manager's per-queue thresholds
+    (resolved from one threshold snapshot) and its alert state machines: a queue alerts
+    when it crosses into Threshold_Exceeded / Queue_Full, not on every snapshot it stays there.
+    Pass partial=True when `queues` is not the whole queue manager (see QueueAlertStates.update).
+    """
+    table = DepthTable(queues)
+    if not len(table):
+        return []
+
+    thresholds = threshold_manager.resolve_thresholds(table.names)
+    table.set_thresholds(thresholds)
+    full, breaching = find_breaches(table)
+    due = threshold_manager.alert_states.update(table.names, table.depth_percentage(), table.threshold, full,
+                                                breaching, now, partial)
+
+    alerts = []
+    for index, level in due:
+        # thresholds[index], not the float column, so alerts show the configured value as given
+        if level == FULL:
+            alerts.append(threshold_manager.queue_full_alert(table.queues[index], thresholds[index]))
+        else:
+            alerts.append(threshold_manager.threshold_exceeded_alert(table.queues[index], thresholds[index]))
+    return alerts
@@ -2,7 +2,10 @@
 # the MQSC command "DISPLAY CONN"
 # Reference: https://www.ibm.com/docs/en/ibm-mq/9.2?topic=reference-display-conn-display-application-connection-information
 
+# Both classes are slotted: an application snapshot can hold 100k+ connections.
 class ConnectedObject:
+    __slots__ = ('objname', 'objtype', 'hstate', 'reada', 'openopts')
+
     def __init__(self, objname=None, objtype=None, hstate=None, reada=None, openopts=None):
         self.objname = objname
         self.objtype = objtype
@@ -11,7 +14,7 @@ class ConnectedObject:
         self.openopts = openopts
 
     def __str__(self):
-        return str(self.__dict__)
+        return str({field: getattr(self, field) for field in self.__slots__})
 
     def to_dict(self):
         return {
@@ -23,6 +26,9 @@ class ConnectedObject:
         }
 
 class Application:
+    __slots__ = ('conn', 'channel', 'type', 'conntag', 'conname', 'connopts', 'appltype', 'appldesc', 'appltag',
+                 'connected_objects')
+
     def __init__(self, conn, channel, type, conntag, conname, connopts, appltype, appldesc, appltag, connected_objects):
         self.conn = conn
         self.channel = channel
@@ -45,7 +51,7 @@ class Application:
         return connected_queues
 
     def __str__(self):
-        return str(self.__dict__)
+        return str({field: getattr(self, field) for field in self.__slots__})
 
     def to_dict(self):
         return {
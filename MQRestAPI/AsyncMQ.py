@@ -0,0 +1,136 @@
+import asyncio
+import datetime
+import json
+import aiohttp
+from MQRestAPI.MQ import Parser, LOGIN_ENDPOINT, QMGR_ENDPOINT, MQSC_ENDPOINT, filter_system_applications
+from MQRestAPI.Query import FULL_PROFILES
+
+
+# A Snapshot bundles everything the dashboard refreshes in one go. All four parts are
+# requested together by AsyncClient.get_snapshot, so they describe the queue manager at
+# (approximately) the same moment rather than four moments spread over a full refresh.
+class Snapshot:
+    def __init__(self, qmgr=None, queues=None, channels=None, applications=None, taken_at=None):
+        self.qmgr = qmgr
+        self.queues = queues if queues is not None else []
+        self.channels = channels if channels is not None else []
+        self.applications = applications if applications is not None else []
+        self.taken_at = taken_at
+
+    def to_dict(self):
+        return {
+            'Queue_Manager': self.qmgr.to_dict() if self.qmgr else None,
+            'All_Queues': [queue.to_dict() for queue in self.queues],
+            'All_Channels': [channel.to_dict() for channel in self.channels],
+            'All_Applications': [app.to_dict() for app in self.applications],
+            'Taken_At': self.taken_at
+        }
+
+
+class AsyncClient:
+    """
+    asyncio counterpart of MQ.Client. Uses the same endpoints, MQSC payloads and Parser, but
+    issues the requests of a snapshot concurrently so a refresh costs one round-trip (the slowest)
+    instead of the sum of all of them.
+    """
+
+    def __init__(self, url, qmgr=None, username=None, password=None, timeout=10, cookies=None):
+        self.baseUrl = url
+        self.qmgr = qmgr
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        # LTPA token cookies; reused across snapshots so we only log in when we have none
+        self.cookies = dict(cookies) if cookies else {}
+
+    @classmethod
+    def from_client(cls, client, timeout=10):
+        """
+        Builds an AsyncClient sharing the login (LTPA cookies) of an already authenticated MQ.Client.
+        """
+        return cls(url=client.baseUrl, qmgr=client.qmgr, username=client.username, password=client.password,
+                   timeout=timeout, cookies=client.session.cookies.get_dict())
+
+    def open_session(self):
+        # unsafe=True: mqweb is usually addressed by IP, and aiohttp drops cookies for IP hosts otherwise
+        return aiohttp.ClientSession(
+            headers={'Accept': 'application/json', 'ibm-mq-rest-csrf-token': 'value'},
+            cookies=self.cookies,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    async def authenticate(self, session):
+        body = json.dumps({"username": self.username, "password": self.password})
+        try:
+            async with session.post(self.baseUrl + LOGIN_ENDPOINT, data=body,
+                                    headers={'Content-Type': 'application/json'}, ssl=False) as response:
+                response.raise_for_status()
+        except asyncio.TimeoutError:
+            raise Exception(f"Authentication request timed out after {self.timeout} seconds.")
+        except aiohttp.ClientError as e:
+            raise Exception(f"Authentication request failed: {str(e)}")
+
+    async def get_request(self, session, endpoint):
+        async with session.get(self.baseUrl + endpoint, ssl=False) as response:
+            response.raise_for_status()
+            return await response.text()
+
+    async def post_request(self, session, endpoint, json_payload):
+        async with session.post(self.baseUrl + endpoint, data=json_payload,
+                                headers={'Content-Type': 'application/json'}, ssl=False) as response:
+            response.raise_for_status()
+            return await response.text()
+
+    async def get_qmgr(self, session):
+        response = await self.get_request(session, QMGR_ENDPOINT.format(qmgr=self.qmgr))
+        return Parser.parse_qmgr_response(json.loads(response))[0]
+
+    async def get_all_queues(self, session, query=None):
+        query = query if query else FULL_PROFILES["queue"]
+        response = await self.get_request(session, query.to_endpoint(self.qmgr))
+        return Parser.parse_queue_response(json.loads(response))
+
+    async def get_all_channels(self, session, query=None):
+        query = query if query else FULL_PROFILES["channel"]
+        response = await self.post_request(session, MQSC_ENDPOINT.format(qmgr=self.qmgr), query.to_payload())
+        return Parser.parse_channel_response(json.loads(response))
+
+    async def get_all_applications(self, session, query=None):
+        query = query if query else FULL_PROFILES["conn"]
+        response = await self.post_request(session, MQSC_ENDPOINT.format(qmgr=self.qmgr), query.to_payload())
+        return filter_system_applications(Parser.parse_application_response(json.loads(response)))
+
+    async def _gather_snapshot(self, session):
+        return await asyncio.gather(
+            self.get_qmgr(session),
+            self.get_all_queues(session),
+            self.get_all_channels(session),
+            self.get_all_applications(session)
+        )
+
+    async def get_snapshot(self):
+        async with self.open_session() as session:
+            if not self.cookies:
+                await self.authenticate(session)
+
+            taken_at = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S')  # ISO 8601 format
+            try:
+                qmgr, queues, channels, applications = await self._gather_snapshot(session)
+            except aiohttp.ClientResponseError as e:
+                if e.status != 401:
+                    raise
+                # LTPA token expired: log in again and repeat the snapshot once
+                await self.authenticate(session)
+                qmgr, queues, channels, applications = await self._gather_snapshot(session)
+
+            # keep the (possibly refreshed) token for the next snapshot
+            self.cookies = {cookie.key: cookie.value for cookie in session.cookie_jar}
+
+        return Snapshot(qmgr=qmgr, queues=queues, channels=channels, applications=applications, taken_at=taken_at)
+
+    def get_snapshot_sync(self):
+        """
+        Runs get_snapshot to completion from synchronous code such as a Flask resource.
+        """
+        return asyncio.run(self.get_snapshot())
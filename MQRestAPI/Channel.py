@@ -1,15 +1,19 @@
 class Channel:
+    __slots__ = ('channelName', 'channelType', 'description', 'maxMessageLength', 'heartbeatInterval',
+                 'transportType', 'transmissionQueueName')
+
     def __init__(self, channelName=None, channelType=None, description=None,
-                 maxMessageLength=None, heartbeatInterval=None, transportType=None):
+                 maxMessageLength=None, heartbeatInterval=None, transportType=None, transmissionQueueName=None):
         self.channelName = channelName
         self.channelType = channelType
         self.description = description
         self.maxMessageLength = maxMessageLength
         self.heartbeatInterval = heartbeatInterval
         self.transportType = transportType
+        self.transmissionQueueName = transmissionQueueName  # XMITQ, sender / server channels only
 
     def __str__(self):
-        return str(self.__dict__)
+        return str({field: getattr(self, field) for field in self.__slots__})
 
     def to_dict(self):
         return {
@@ -19,4 +23,5 @@ class Channel:
             "max_message_length": self.maxMessageLength,
             "heartbeat_interval": self.heartbeatInterval,
             "transport_type": self.transportType,
+            "transmission_queue_name": self.transmissionQueueName,
         }
@@ -0,0 +1,106 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from MQRestAPI.MQ import Client
+
+
+# Holds one authenticated MQ.Client per queue manager so a single backend can serve
+# many queue managers instead of one process per queue manager.
+class ClientRegistry:
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def login(self, url, qmgr, username, password):
+        """
+        Authenticates a new Client for the queue manager and registers it, replacing any previous one.
+        """
+        client = Client(url=url, qmgr=qmgr, username=username, password=password)
+        self.register(client)
+        return client
+
+    def register(self, client):
+        with self._lock:
+            self._clients[client.qmgr] = client
+
+    def remove(self, qmgr):
+        with self._lock:
+            return self._clients.pop(qmgr, None)
+
+    def get(self, qmgr):
+        with self._lock:
+            return self._clients.get(qmgr)
+
+    def qmgr_names(self):
+        with self._lock:
+            return sorted(self._clients)
+
+    def items(self):
+        with self._lock:
+            return list(self._clients.items())
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+
+class FanOutCollector:
+    """
+    Gathers MQ objects from every registered queue manager in parallel over a bounded
+    worker pool. Each queue manager is handled by a single task, so a Client's session is
+    never used from two threads at once.
+    """
+
+    OBJECT_TYPES = {
+        'queues': 'get_all_queues',
+        'channels': 'get_all_channels',
+        'applications': 'get_all_applications'
+    }
+
+    def __init__(self, registry, max_workers=8):
+        self.registry = registry
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mq-fanout")
+
+    def collect(self, object_types=None, qmgrs=None):
+        """
+        Returns ({qmgr: {object_type: [objects]}}, {qmgr: error message}) for the requested
+        object types (default: all) and queue managers (default: all registered).
+        """
+        object_types = object_types or list(self.OBJECT_TYPES)
+        for object_type in object_types:
+            if object_type not in self.OBJECT_TYPES:
+                raise ValueError(f"Unknown object type '{object_type}'. Expected one of {list(self.OBJECT_TYPES)}.")
+
+        return self.run(lambda client: self._collect_one(client, object_types), qmgrs)
+
+    def run(self, task, qmgrs=None):
+        """
+        Calls task(client) for every registered queue manager (default: all) in parallel and
+        returns ({qmgr: result}, {qmgr: error message}).
+        """
+        clients = [(name, client) for name, client in self.registry.items() if qmgrs is None or name in qmgrs]
+        futures = {name: self._executor.submit(task, client) for name, client in clients}
+
+        results, errors = {}, {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = str(e)
+        return results, errors
+
+    def _collect_one(self, client, object_types):
+        return {object_type: getattr(client, self.OBJECT_TYPES[object_type])() for object_type in object_types}
+
+    @staticmethod
+    def merge(results, object_type):
+        """
+        Flattens per-qmgr results into one list of dicts, each tagged with its queue manager name.
+        """
+        merged = []
+        for qmgr_name in sorted(results):
+            for obj in results[qmgr_name].get(object_type, []):
+                merged.append(dict(obj.to_dict(), qmgr_name=qmgr_name))
+        return merged
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -2,96 +2,598 @@
 # such as queues, channels, and applications to extract (and sometimes infer)
 # the "connectedness" amongst those entities.
 #
-# It is worth noting that the so-called "Dependency Graph" is not actually
-# represented with a graph data strucutre, but rather dictionaries where
-# the key is the name of the entity and the value is a list of entities
-# that directly/indirectly relates to the key entity.
+# The graph is an indexed adjacency structure: every entity is a typed node with an integer id,
+# and every relationship a typed, deduplicated edge A -> B meaning "A depends on B" (an alias
+# on its target, a remote queue on its transmission queue, an application on the queues it has
+# open, ...). Each node keeps its outgoing and incoming edges, so both directions of a query are
+# a plain breadth-first walk:
+#   downstream(X): everything X transitively depends on
+#   upstream(X):   everything that transitively depends on X, i.e. what breaks if X fails or fills
+#
+# The graph is maintained incrementally. Each listed object owns the outgoing edges of its node;
+# upserting it diffs the edges it should have against the ones it has, and removing it drops
+# them. Referenced-only nodes (a remote queue's target on another queue manager, a queue an
+# application opened that was not listed) exist for as long as something points at them.
+# Cached reachability results remember which nodes they passed through, and an edge change only
+# invalidates the results that went through its endpoints, so a refresh costs in proportion to
+# what changed (typically application connections), not to the size of the topology.
+#
+# A network graph spans several queue managers: build_network_graph fetches and builds one
+# subgraph per queue manager concurrently, then merges them. Node ids are global, so a remote
+# queue's target node simply becomes the listed queue on the other queue manager once its
+# subgraph is merged; sender / server channels are then linked to the receiver / requester of
+# the same name elsewhere, which lets message_route follow a message hop by hop. Network graphs
+# are rebuilt rather than synced, since the channel links are not owned by any one object.
+#
+# Besides the legacy nested dict, the graph exports a compact form for clients loading large
+# topologies: nodes renumbered 0..n-1, every string (kind, qmgr, name, subtype, edge type)
+# stored once in a string table and referenced by index, and the outgoing edges as offset
+# arrays (CSR), either as JSON lists or as a little-endian binary blob (see to_binary).
+#
+# Node ids are "<kind>:<qmgr>.<name>" (e.g. "queue:QM1.XMIT.TO.QM2"), since queues, channels and
+# connections have separate namespaces in MQ.
 
-from MQRestAPI.Queues import RemoteQueue,  AliasQueue
-from MQRestAPI.Channel import SenderChannel
+import struct
+from collections import deque
+from threading import RLock
 
+import numpy as np
 
-class DependencyGraph:
-    def __init__(self):
-        self.direct_dependencies = {}
-        self.indirect_dependencies = {}
-        # Implicit Dependencies (i.e., the connectedness betweeen a sender and receiver channel pair)
-        # is beyond the scope of the initial release. Consider for future implementation.
-        self.implicit_dependencies = {} # For future implementation
-        self.QM_NAME_DELIMITER = "."
+from MQRestAPI.Queues import RemoteQueue, AliasQueue
+
+QUEUE, CHANNEL, APPLICATION = "queue", "channel", "application"
+
+# edge types, A -> B
+RESOLVES_TO = "resolves_to"  # alias queue -> target queue
+ROUTES_VIA = "routes_via"  # remote queue -> transmission queue
+TARGETS = "targets"  # remote queue -> queue on the remote queue manager
+SERVES = "serves"  # sender / server channel -> the transmission queue it drains
+OPENS = "opens"  # application -> queue it has open
+CONNECTS_VIA = "connects_via"  # application -> its channel
+DELIVERS_TO = "delivers_to"  # sender / server channel -> its partner on another queue manager (network graphs)
+
+SENDING_CHANNEL_TYPES = ("SDR", "SVR")
+RECEIVING_CHANNEL_TYPES = ("RCVR", "RQSTR")
+
+
+class GraphNode:
+    __slots__ = ('id', 'kind', 'qmgr', 'name', 'subtype', 'listed')
+
+    def __init__(self, id, kind, qmgr, name, subtype=None):
+        self.id = id
+        self.kind = kind
+        self.qmgr = qmgr
+        self.name = name
+        self.subtype = subtype  # e.g. queue type or channel type, None if only known as a reference
+        self.listed = False  # True while the object itself is in a snapshot, not just referenced
 
     def to_dict(self):
         return {
-            'direct_dependencies': self.direct_dependencies,
-            'indirect_dependencies': self.indirect_dependencies,
-            'implicit_dependencies': self.implicit_dependencies,
-            'QM_NAME_DELIMITER': self.QM_NAME_DELIMITER
+            'id': self.id,
+            'kind': self.kind,
+            'qmgr': self.qmgr,
+            'name': self.name,
+            'subtype': self.subtype
         }
 
+
+def object_edges(kind, obj, qmgr):
+    """
+    (name, subtype, ((target kind, target qmgr, target name, edge type), ...)) for a listed
+    queue, channel or application. Also serves as the object's signature: while it is unchanged,
+    the object's part of the graph is too.
+    """
+    if kind == QUEUE:
+        edges = []
+        if isinstance(obj, AliasQueue) and obj.target_queue_name:
+            edges.append((QUEUE, qmgr, obj.target_queue_name, RESOLVES_TO))
+        if isinstance(obj, RemoteQueue):
+            # a blank XMITQ means the transmission queue named after the remote queue manager
+            transmission_queue = obj.transmission_queue_name or obj.target_qmgr_name
+            if transmission_queue:
+                edges.append((QUEUE, qmgr, transmission_queue, ROUTES_VIA))
+            if obj.target_qmgr_name and obj.target_queue_name:
+                edges.append((QUEUE, obj.target_qmgr_name, obj.target_queue_name, TARGETS))
+        return obj.queue_name, obj.type_name, tuple(edges)
+
+    if kind == CHANNEL:
+        edges = ()
+        if obj.channelType in SENDING_CHANNEL_TYPES and obj.transmissionQueueName:
+            edges = ((QUEUE, qmgr, obj.transmissionQueueName, SERVES),)
+        return obj.channelName, obj.channelType, edges
+
+    edges = [(QUEUE, qmgr, queue_name, OPENS) for queue_name in obj.get_connected_queues()]
+    if obj.channel:
+        edges.append((CHANNEL, qmgr, obj.channel, CONNECTS_VIA))
+    return obj.conn, obj.appltype, tuple(edges)
+
+
+class DependencyGraph:
+    def __init__(self):
+        self.QM_NAME_DELIMITER = "."
+        self.version = 0  # bumped by every change
+        self._index = {}  # node id -> integer index
+        self._nodes = []  # index -> GraphNode, None once removed
+        self._out = []  # index -> {index depended on: edge type}
+        self._in = []  # index -> {index depending on this one: edge type}
+        self._free = []  # indexes of removed nodes, reused first
+        self._removing = set()  # indexes being removed, which dropping their edges must not remove again
+        self._signatures = {}  # (kind, qmgr) -> {listed object name: object_edges(...)}
+        self._reachable = {}  # (direction, index, max depth) -> [(index, depth)]
+        self._reach_members = {}  # index -> cached reachability keys whose walk started at or passed it
+        self._lock = RLock()
+
+    def node_id(self, kind, qmgr, name):
+        return kind + ":" + qmgr + self.QM_NAME_DELIMITER + name
+
+    #############################
+    #         MUTATION          #
+    #############################
+
+    def _invalidate(self, index, direction):
+        # drops the cached walks in `direction` that started at or went through `index`
+        for key in [key for key in self._reach_members.get(index, ()) if key[0] == direction]:
+            reached = self._reachable.pop(key, None)
+            if reached is None:
+                continue
+            for member in [key[1]] + [reached_index for reached_index, _ in reached]:
+                members = self._reach_members.get(member)
+                if members is not None:
+                    members.discard(key)
+                    if not members:
+                        del self._reach_members[member]
+
+    def add_node(self, kind, qmgr, name, subtype=None):
+        """
+        Returns the index of the node, adding it if needed. A subtype given for an existing
+        node (e.g. once a referenced queue is actually listed) replaces the old one.
+        """
+        node_id = self.node_id(kind, qmgr, name)
+        with self._lock:
+            index = self._index.get(node_id)
+            if index is not None:
+                node = self._nodes[index]
+                if subtype is not None and node.subtype != subtype:
+                    node.subtype = subtype
+                    self.version += 1
+                return index
+
+            node = GraphNode(node_id, kind, qmgr, name, subtype)
+            if self._free:
+                index = self._free.pop()
+                self._nodes[index], self._out[index], self._in[index] = node, {}, {}
+            else:
+                index = len(self._nodes)
+                self._nodes.append(node)
+                self._out.append({})
+                self._in.append({})
+            self._index[node_id] = index
+            self.version += 1
+            return index
+
+    def add_edge(self, source, target, edge_type):
+        # source depends on target; a repeated edge is stored once
+        with self._lock:
+            if self._out[source].get(target) == edge_type:
+                return
+            self._out[source][target] = edge_type
+            self._in[target][source] = edge_type
+            self._invalidate(source, 'downstream')
+            self._invalidate(target, 'upstream')
+            self.version += 1
+
+    def remove_edge(self, source, target):
+        with self._lock:
+            if self._out[source].pop(target, None) is None:
+                return
+            del self._in[target][source]
+            self._invalidate(source, 'downstream')
+            self._invalidate(target, 'upstream')
+            self.version += 1
+            self._drop_if_orphaned(target)
+
+    def _drop_if_orphaned(self, index):
+        # referenced-only nodes go once nothing references them any more
+        node = self._nodes[index]
+        if node is not None and not node.listed and index not in self._removing \
+                and not self._in[index] and not self._out[index]:
+            self._remove_index(index)
+
+    def _remove_index(self, index):
+        node_id = self._nodes[index].id
+        self._removing.add(index)
+        try:
+            for target in list(self._out[index]):
+                self.remove_edge(index, target)
+            for source in list(self._in[index]):
+                self.remove_edge(source, index)
+        finally:
+            self._removing.discard(index)
+        self._invalidate(index, 'downstream')
+        self._invalidate(index, 'upstream')
+        del self._index[node_id]
+        self._nodes[index] = None
+        self._free.append(index)
+        self.version += 1
+
+    def remove_node(self, node_id):
+        with self._lock:
+            index = self._index.get(node_id)
+            if index is not None:
+                self._remove_index(index)
+
+    def upsert(self, kind, obj, qmgr):
+        """
+        Adds or updates one listed object: its node, and exactly the outgoing edges it should have.
+        """
+        self._upsert(kind, qmgr, object_edges(kind, obj, qmgr))
+
+    def _upsert(self, kind, qmgr, signature):
+        name, subtype, edges = signature
+        with self._lock:
+            index = self.add_node(kind, qmgr, name, subtype)
+            self._nodes[index].listed = True
+
+            wanted = {}
+            for target_kind, target_qmgr, target_name, edge_type in edges:
+                wanted[self.add_node(target_kind, target_qmgr, target_name)] = edge_type
+            for target in [target for target in self._out[index] if target not in wanted]:
+                self.remove_edge(index, target)
+            for target, edge_type in wanted.items():
+                self.add_edge(index, target, edge_type)
+            self._signatures.setdefault((kind, qmgr), {})[name] = signature
+
+    def remove(self, kind, qmgr, name):
+        """
+        Removes a listed object: its outgoing edges go, and the node too unless something still
+        depends on it (it then stays as a referenced-only node).
+        """
+        with self._lock:
+            self._signatures.get((kind, qmgr), {}).pop(name, None)
+            index = self._index.get(self.node_id(kind, qmgr, name))
+            if index is None:
+                return
+            node = self._nodes[index]
+            node.listed = False
+            node.subtype = None
+            for target in list(self._out[index]):
+                self.remove_edge(index, target)
+            self._drop_if_orphaned(index)
+
+    def apply_changes(self, kind, qmgr, upserted, removed_names):
+        """
+        Applies a delta: `upserted` objects added or changed since the last update, and the
+        names of the objects removed since then. Changes that do not alter an object's edges
+        (a queue's depth, say) leave the graph alone.
+        """
+        with self._lock:
+            known = self._signatures.get((kind, qmgr), {})
+            for name in removed_names:
+                self.remove(kind, qmgr, name)
+            for obj in upserted:
+                signature = object_edges(kind, obj, qmgr)
+                if known.get(signature[0]) != signature:
+                    self._upsert(kind, qmgr, signature)
+
+    def sync(self, kind, qmgr, objects):
+        """
+        Brings the graph in line with a full listing of `kind` objects on `qmgr`. Objects whose
+        signature is unchanged are skipped, so only churn touches the graph.
+        """
+        with self._lock:
+            known = self._signatures.get((kind, qmgr), {})
+            seen = set()
+            for obj in objects:
+                if kind == CHANNEL and not hasattr(obj, 'channelName'):
+                    continue
+                signature = object_edges(kind, obj, qmgr)
+                seen.add(signature[0])
+                if known.get(signature[0]) != signature:
+                    self._upsert(kind, qmgr, signature)
+            for name in [name for name in known if name not in seen]:
+                self.remove(kind, qmgr, name)
+
     def create_dependency_graph(self, queues, channels, applications, qmgr):
-        # Assuming MQ.Queue, MQ.Channel, MQ.Application etc are defined elsewhere
-        for queue in queues:
-            if isinstance(queue, AliasQueue):
-                # Direct dependency of the alias queue
-                direct_dependency = [qmgr + self.QM_NAME_DELIMITER + queue.target_queue_name]
-                self.add_dependency(self.direct_dependencies, qmgr, queue.queue_name, direct_dependency)
-
-                # Indirect dependency for the target queue of the alias queue
-                indirect_dependency = [qmgr + self.QM_NAME_DELIMITER + queue.queue_name]
-                self.add_dependency(self.indirect_dependencies, qmgr, queue.target_queue_name, indirect_dependency)
-
-            if isinstance(queue, RemoteQueue):
-                # Direct dependency of the remote queue
-                direct_dependency = [qmgr + self.QM_NAME_DELIMITER + queue.transmission_queue_name,
-                                     queue.target_qmgr_name + self.QM_NAME_DELIMITER + queue.target_queue_name]
-                self.add_dependency(self.direct_dependencies, qmgr, queue.queue_name, direct_dependency)
-
-                # Indirect dependency for the transmission queue and target queue of the remote queue
-                indirect_dependency_trans = [qmgr + self.QM_NAME_DELIMITER + queue.queue_name]
-                self.add_dependency(self.indirect_dependencies, qmgr, queue.transmission_queue_name,
-                                    indirect_dependency_trans)
-
-                indirect_dependency_target = [qmgr + self.QM_NAME_DELIMITER + queue.queue_name]
-                self.add_dependency(self.indirect_dependencies, queue.target_qmgr_name, queue.target_queue_name,
-                                    indirect_dependency_target)
-
-
-        for channel in channels:
-            if isinstance(channel, SenderChannel):
-                # Direct dependency of sender channel
-                direct_dependency = [qmgr + self.QM_NAME_DELIMITER + channel.transmission_queue_name]
-                self.add_dependency(self.direct_dependencies, qmgr, channel.channel_name, direct_dependency)
-
-                # Indirect dependency for the transmission queue of the sender channel
-                indirect_dependency = [qmgr + self.QM_NAME_DELIMITER + channel.channel_name]
-                self.add_dependency(self.indirect_dependencies, qmgr, channel.transmission_queue_name, indirect_dependency)
-
-        for application in applications:
-            connected_queues = application.get_connected_queues()
-            for i in range(len(connected_queues)):
-                # Indirect dependency for the connected queues of the application
-                indirect_dependency_queue = [qmgr + self.QM_NAME_DELIMITER + application.conn]
-                self.add_dependency(self.indirect_dependencies, qmgr, connected_queues[i], indirect_dependency_queue)
-
-            # Indirect dependency for the application channel
-            indirect_dependency_channel = [qmgr + self.QM_NAME_DELIMITER + application.conn]
-            self.add_dependency(self.indirect_dependencies, qmgr, application.channel, indirect_dependency_channel)
-
-            # Direct dependency for the application (here connectedQueues are the direct dependency)
-            for i in range(len(connected_queues)):
-                connected_queues[i] = qmgr + self.QM_NAME_DELIMITER + connected_queues[i]
-
-            connected_queues.append(qmgr + self.QM_NAME_DELIMITER + application.channel)
-            self.add_dependency(self.direct_dependencies, qmgr, application.conn, connected_queues)
+        with self._lock:
+            self.sync(QUEUE, qmgr, queues)
+            self.sync(CHANNEL, qmgr, channels)
+            self.sync(APPLICATION, qmgr, applications)
+
+    def merge(self, other):
+        """
+        Adds every node and edge of `other` (typically another queue manager's subgraph).
+        Nodes with the same id are unified, a listed node winning over a reference.
+        """
+        with self._lock, other._lock:
+            mapping = {}
+            for index, node in enumerate(other._nodes):
+                if node is None:
+                    continue
+                mapping[index] = self.add_node(node.kind, node.qmgr, node.name, node.subtype)
+                if node.listed:
+                    self._nodes[mapping[index]].listed = True
+            for index, targets in enumerate(other._out):
+                for target, edge_type in targets.items():
+                    self.add_edge(mapping[index], mapping[target], edge_type)
+            for key, signatures in other._signatures.items():
+                self._signatures.setdefault(key, {}).update(signatures)
+
+    def link_channels(self):
+        """
+        Links every sender / server channel to the receiver / requester channels of the same
+        name on other queue managers; returns the number of links added.
+        """
+        with self._lock:
+            receivers = {}
+            for index, node in enumerate(self._nodes):
+                if node is not None and node.kind == CHANNEL and node.subtype in RECEIVING_CHANNEL_TYPES:
+                    receivers.setdefault(node.name, []).append(index)
+
+            links = 0
+            for index, node in enumerate(self._nodes):
+                if node is None or node.kind != CHANNEL or node.subtype not in SENDING_CHANNEL_TYPES:
+                    continue
+                for receiver in receivers.get(node.name, ()):
+                    if self._nodes[receiver].qmgr != node.qmgr:
+                        self.add_edge(index, receiver, DELIVERS_TO)
+                        links += 1
+            return links
 
     def clear_dependency(self):
-        self.direct_dependencies.clear()
-        self.indirect_dependencies.clear()
-        self.implicit_dependencies.clear()
-
-    def add_dependency(self, dependencies, qmName, entityName, dependency):
-        key = qmName + self.QM_NAME_DELIMITER + entityName
-        if key not in dependencies:
-            dependencies[key] = dependency
-        else:
-            dependencies[key].extend(dependency)
+        with self._lock:
+            self._index.clear()
+            self._nodes, self._out, self._in, self._free = [], [], [], []
+            self._signatures.clear()
+            self._removing.clear()
+            self._reachable.clear()
+            self._reach_members.clear()
+            self.version += 1
+
+    #############################
+    #          QUERIES          #
+    #############################
+
+    def node(self, node_id):
+        with self._lock:
+            index = self._index.get(node_id)
+            return None if index is None else self._nodes[index]
+
+    def __len__(self):
+        return len(self._index)
+
+    def _walk(self, index, adjacency, max_depth):
+        # breadth first, so each node is reported at its shortest distance; cycles are visited once
+        depths = {index: 0}
+        frontier = deque([index])
+        while frontier:
+            current = frontier.popleft()
+            depth = depths[current]
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for neighbour in adjacency[current]:
+                if neighbour not in depths:
+                    depths[neighbour] = depth + 1
+                    frontier.append(neighbour)
+        del depths[index]
+        return list(depths.items())
+
+    def _reach(self, node_id, direction, max_depth):
+        with self._lock:
+            index = self._index.get(node_id)
+            if index is None:
+                return None
+            key = (direction, index, max_depth)
+            reached = self._reachable.get(key)
+            if reached is None:
+                reached = self._walk(index, self._out if direction == 'downstream' else self._in, max_depth)
+                self._reachable[key] = reached
+                for member in [index] + [reached_index for reached_index, _ in reached]:
+                    self._reach_members.setdefault(member, set()).add(key)
+            return [(self._nodes[reached_index], depth) for reached_index, depth in reached]
+
+    def downstream(self, node_id, max_depth=None):
+        """
+        [(GraphNode, distance), ...] for everything `node_id` depends on, nearest first;
+        None if the node is unknown.
+        """
+        return self._reach(node_id, 'downstream', max_depth)
+
+    def upstream(self, node_id, max_depth=None):
+        """
+        [(GraphNode, distance), ...] for everything that depends on `node_id` - the impact set
+        if it fails or fills up - nearest first; None if the node is unknown.
+        """
+        return self._reach(node_id, 'upstream', max_depth)
+
+    def path(self, source_id, target_id):
+        """
+        Shortest dependency chain from source to target as [(GraphNode, edge type into it), ...]
+        (the first entry has no edge type); None if source does not depend on target.
+        """
+        with self._lock:
+            source, target = self._index.get(source_id), self._index.get(target_id)
+            if source is None or target is None:
+                return None
+            previous = {source: None}
+            frontier = deque([source])
+            while frontier and target not in previous:
+                current = frontier.popleft()
+                for neighbour in self._out[current]:
+                    if neighbour not in previous:
+                        previous[neighbour] = current
+                        frontier.append(neighbour)
+            if target not in previous:
+                return None
+
+            chain = []
+            current = target
+            while current is not None:
+                parent = previous[current]
+                chain.append((self._nodes[current], None if parent is None else self._out[parent][current]))
+                current = parent
+            return chain[::-1]
+
+    def message_route(self, node_id, max_hops=64):
+        """
+        Where a message put to queue `node_id` goes, as [(GraphNode, edge type relating it to the
+        previous hop), ...]: through aliases and remote queue definitions, and for each remote
+        hop the transmission queue, the channel serving it and that channel's partner, up to the
+        first queue that is neither (or is only known as a reference). None if the node is unknown.
+        """
+        def first(edges, wanted):
+            return next((index for index, edge_type in edges.items() if edge_type == wanted), None)
+
+        with self._lock:
+            index = self._index.get(node_id)
+            if index is None:
+                return None
+            route = [(index, None)]
+            seen = {index}
+            while len(route) < max_hops:
+                out = self._out[index]
+                target, edge_type = first(out, RESOLVES_TO), RESOLVES_TO
+                if target is None:
+                    target, edge_type = first(out, TARGETS), TARGETS
+                    if target is None:
+                        break
+                    transmission_queue = first(out, ROUTES_VIA)
+                    if transmission_queue is not None:
+                        route.append((transmission_queue, ROUTES_VIA))
+                        channel = first(self._in[transmission_queue], SERVES)
+                        if channel is not None:
+                            route.append((channel, SERVES))
+                            partner = first(self._out[channel], DELIVERS_TO)
+                            if partner is not None:
+                                route.append((partner, DELIVERS_TO))
+                if target in seen:
+                    break  # a definition loop
+                seen.add(target)
+                route.append((target, edge_type))
+                index = target
+            return [(self._nodes[index], edge_type) for index, edge_type in route]
+
+    def edges(self, node_id):
+        """
+        {'depends_on': [(GraphNode, edge type)], 'depended_on_by': [(GraphNode, edge type)]}
+        """
+        with self._lock:
+            index = self._index.get(node_id)
+            if index is None:
+                return None
+            return {
+                'depends_on': [(self._nodes[target], edge_type) for target, edge_type in self._out[index].items()],
+                'depended_on_by': [(self._nodes[source], edge_type) for source, edge_type in self._in[index].items()]
+            }
+
+    def to_dict(self):
+        # the original dictionary form, keyed by "<qmgr>.<name>". Kinds share that key (a sender
+        # channel is often named after its XMITQ), so colliding nodes extend one list, as before.
+        def qualified(node):
+            return node.qmgr + self.QM_NAME_DELIMITER + node.name
+
+        with self._lock:
+            direct, indirect = {}, {}
+            for index, node in enumerate(self._nodes):
+                if node is None:
+                    continue
+                if self._out[index]:
+                    direct.setdefault(qualified(node), []).extend(
+                        qualified(self._nodes[target]) for target in self._out[index])
+                if self._in[index]:
+                    indirect.setdefault(qualified(node), []).extend(
+                        qualified(self._nodes[source]) for source in self._in[index])
+            return {
+                'direct_dependencies': direct,
+                'indirect_dependencies': indirect,
+                'implicit_dependencies': {},  # sender / receiver pairs; only linked in network graphs
+                'QM_NAME_DELIMITER': self.QM_NAME_DELIMITER
+            }
+
+    def to_compact(self):
+        """
+        {'version', 'strings': [...], 'node_kind' / 'node_qmgr' / 'node_name' / 'node_subtype':
+        [string index, -1 for none], 'out_offsets': [n + 1], 'out_targets': [node], 'out_types':
+        [string index]}. The edges of node i are out_targets[out_offsets[i]:out_offsets[i + 1]].
+        """
+        strings, string_index = [], {}
+
+        def intern(value):
+            if value is None:
+                return -1
+            index = string_index.get(value)
+            if index is None:
+                index = string_index[value] = len(strings)
+                strings.append(value)
+            return index
+
+        with self._lock:
+            live = [index for index, node in enumerate(self._nodes) if node is not None]
+            renumbered = {index: position for position, index in enumerate(live)}
+            kinds, qmgrs, names, subtypes = [], [], [], []
+            offsets, targets, types = [0], [], []
+            for index in live:
+                node = self._nodes[index]
+                kinds.append(intern(node.kind))
+                qmgrs.append(intern(node.qmgr))
+                names.append(intern(node.name))
+                subtypes.append(intern(node.subtype))
+                for target, edge_type in self._out[index].items():
+                    targets.append(renumbered[target])
+                    types.append(intern(edge_type))
+                offsets.append(len(targets))
+            return {
+                'version': self.version,
+                'strings': strings,
+                'node_kind': kinds,
+                'node_qmgr': qmgrs,
+                'node_name': names,
+                'node_subtype': subtypes,
+                'out_offsets': offsets,
+                'out_targets': targets,
+                'out_types': types
+            }
+
+    BINARY_MAGIC = b'MQDG'
+    BINARY_FORMAT_VERSION = 1
+
+    def to_binary(self, compact=None):
+        """
+        to_compact() (or the given result of it) as bytes, all little-endian: magic 'MQDG',
+        uint32 format version, uint64 graph version, uint32 node / edge / string counts, then
+        int32 arrays node_kind, node_qmgr, node_name, node_subtype (n each), out_offsets (n + 1),
+        out_targets and out_types (edges each), string_offsets (strings + 1), and the UTF-8
+        string bytes.
+        """
+        compact = self.to_compact() if compact is None else compact
+        encoded = [string.encode('utf-8') for string in compact['strings']]
+        string_offsets = np.zeros(len(encoded) + 1, dtype='<i4')
+        np.cumsum([len(string) for string in encoded], out=string_offsets[1:])
+
+        parts = [struct.pack('<4sIQIII', self.BINARY_MAGIC, self.BINARY_FORMAT_VERSION, compact['version'],
+                             len(compact['node_kind']), len(compact['out_targets']), len(encoded))]
+        for field in ('node_kind', 'node_qmgr', 'node_name', 'node_subtype', 'out_offsets', 'out_targets',
+                      'out_types'):
+            parts.append(np.asarray(compact[field], dtype='<i4').tobytes())
+        parts.append(string_offsets.tobytes())
+        parts.extend(encoded)
+        return b''.join(parts)
+
+
+def build_network_graph(collector, qmgrs=None):
+    """
+    Fetches and builds the subgraph of every queue manager registered with `collector` (a
+    ClientRegistry.FanOutCollector) in parallel, one task per queue manager, then merges them
+    and links their channels. Returns (DependencyGraph, {qmgr: error message}).
+    """
+    def build(client):
+        graph = DependencyGraph()
+        graph.create_dependency_graph(client.get_all_queues(), client.get_all_channels(),
+                                      client.get_all_applications(), client.qmgr)
+        return graph
+
+    subgraphs, errors = collector.run(build, qmgrs)
+    network = DependencyGraph()
+    for qmgr_name in sorted(subgraphs):
+        network.merge(subgraphs[qmgr_name])
+    network.link_channels()
+    return network, errors
@@ -0,0 +1,200 @@
+# Level-of-detail view of a DependencyGraph, for clients that cannot draw every object.
+#
+# Nodes are grouped into a cluster hierarchy: queue manager, then object kind, then one of
+#   prefix: the dot-separated name prefixes (DEV, DEV.QUEUE, ...) up to MAX_PREFIX_LEVELS deep
+#   type:   the queue / channel / application type
+#   tag:    the application tag for applications (the type for everything else)
+# Every cluster carries aggregates of its subtree (node counts per kind, total queue depth,
+# highest depth percentage, open issues). A view of one cluster lists its child clusters
+# collapsed, the nodes directly under it, and the graph edges between those items summed per
+# pair, so a client starts at the root and expands clusters as the user zooms in.
+#
+# A hierarchy is built once from a to_compact() export of the graph, and each view is computed
+# the first time it is asked for and then kept, so the hierarchy is meant to be cached per
+# snapshot and rebuilt only when the graph, the depths or the open issues change.
+
+import numpy as np
+
+GROUPINGS = ('prefix', 'type', 'tag')
+MAX_PREFIX_LEVELS = 3
+CLUSTER_PATH_DELIMITER = '|'  # not a valid character in MQ object names
+
+
+class Cluster:
+    __slots__ = ('id', 'label', 'level', 'children', 'leaves', 'members', 'kinds', 'depth', 'max_depth_pct',
+                 'issues')
+
+    def __init__(self, id, label, level):
+        self.id = id
+        self.label = label
+        self.level = level
+        self.children = {}  # label -> Cluster
+        self.leaves = []  # node positions directly in this cluster
+        self.members = []  # node positions anywhere in the subtree
+        self.kinds = {}  # kind -> node count in the subtree
+        self.depth = 0  # sum of the queue depths in the subtree
+        self.max_depth_pct = None
+        self.issues = 0
+
+    def summary(self):
+        return {
+            'id': self.id,
+            'label': self.label,
+            'level': self.level,
+            'size': len(self.members),
+            'kinds': self.kinds,
+            'clusters': len(self.children),
+            'depth': self.depth,
+            'max_depth_pct': self.max_depth_pct,
+            'issues': self.issues
+        }
+
+
+class GraphClusters:
+    def __init__(self, compact, group_by='prefix', tag_of=None, metrics=None):
+        """
+        compact: DependencyGraph.to_compact(); tag_of(kind, qmgr, name) -> application tag or None;
+        metrics(kind, qmgr, name) -> (current depth or None, depth percentage or None, open issues).
+        """
+        if group_by not in GROUPINGS:
+            raise ValueError(f"Unknown grouping '{group_by}'. Expected one of {list(GROUPINGS)}.")
+        self.group_by = group_by
+        self.version = compact['version']
+
+        strings = compact['strings']
+        self._kinds = [strings[index] for index in compact['node_kind']]
+        self._qmgrs = [strings[index] for index in compact['node_qmgr']]
+        self._names = [strings[index] for index in compact['node_name']]
+        self._subtypes = [None if index < 0 else strings[index] for index in compact['node_subtype']]
+        self._strings = strings
+
+        # outgoing edges as given, incoming edges as the same CSR sorted by target
+        self._out_offsets = np.asarray(compact['out_offsets'], dtype=np.int64)
+        self._out_targets = np.asarray(compact['out_targets'], dtype=np.int64)
+        self._out_types = np.asarray(compact['out_types'], dtype=np.int64)
+        sources = np.repeat(np.arange(len(self._names)), np.diff(self._out_offsets))
+        by_target = np.argsort(self._out_targets, kind='stable')
+        self._in_sources = sources[by_target]
+        self._in_offsets = np.zeros(len(self._names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._out_targets, minlength=len(self._names)), out=self._in_offsets[1:])
+
+        self._metrics = [metrics(*self._key(position)) if metrics else (None, None, 0)
+                         for position in range(len(self._names))]
+        self.root = Cluster(self.group_by + ':', None, 0)
+        self._clusters = {self.root.id: self.root}
+        self._chains = [self._place(position, tag_of) for position in range(len(self._names))]
+        self._views = {}  # cluster id -> view without the leaf limit applied
+        self._positions = None  # node id -> position, built on first cluster_of
+
+    def _key(self, position):
+        return self._kinds[position], self._qmgrs[position], self._names[position]
+
+    def _path(self, position, tag_of):
+        kind, qmgr, name = self._key(position)
+        subtype = self._subtypes[position]
+        if self.group_by == 'type':
+            return qmgr, kind, subtype or 'referenced'
+        if self.group_by == 'tag':
+            tag = tag_of(kind, qmgr, name) if tag_of and kind == 'application' else None
+            return qmgr, kind, tag or subtype or 'referenced'
+        segments = name.split('.')[:-1][:MAX_PREFIX_LEVELS]
+        return (qmgr, kind) + tuple('.'.join(segments[:length + 1]) for length in range(len(segments)))
+
+    def _place(self, position, tag_of):
+        # files the node under its cluster path, adding its metrics to every cluster on the way
+        depth, depth_pct, issues = self._metrics[position]
+        kind = self._kinds[position]
+        chain = [self.root]
+        cluster = self.root
+        labels = self._path(position, tag_of)
+        for level, label in enumerate(labels, start=1):
+            child = cluster.children.get(label)
+            if child is None:
+                child_id = self.group_by + ':' + CLUSTER_PATH_DELIMITER.join(labels[:level])
+                child = cluster.children[label] = self._clusters[child_id] = Cluster(child_id, label, level)
+            cluster = child
+            chain.append(cluster)
+        cluster.leaves.append(position)
+
+        for cluster in chain:
+            cluster.members.append(position)
+            cluster.kinds[kind] = cluster.kinds.get(kind, 0) + 1
+            cluster.depth += depth or 0
+            if depth_pct is not None and (cluster.max_depth_pct is None or depth_pct > cluster.max_depth_pct):
+                cluster.max_depth_pct = depth_pct
+            cluster.issues += issues
+        return chain
+
+    def node_id(self, position):
+        kind, qmgr, name = self._key(position)
+        return kind + ":" + qmgr + "." + name
+
+    def _node_dict(self, position):
+        kind, qmgr, name = self._key(position)
+        depth, depth_pct, issues = self._metrics[position]
+        return {'id': self.node_id(position), 'kind': kind, 'qmgr': qmgr, 'name': name,
+                'subtype': self._subtypes[position], 'depth': depth, 'depth_pct': depth_pct, 'issues': issues}
+
+    def _representative(self, position, cluster):
+        # what stands for the node in a view of `cluster`: a child cluster id, its own id, or None if outside
+        chain = self._chains[position]
+        if len(chain) <= cluster.level or chain[cluster.level] is not cluster:
+            return None
+        if len(chain) > cluster.level + 1:
+            return chain[cluster.level + 1].id
+        return self.node_id(position)
+
+    def _build_view(self, cluster):
+        edges, external = {}, {}
+        for position in cluster.members:
+            source = self._representative(position, cluster)
+            for offset in range(self._out_offsets[position], self._out_offsets[position + 1]):
+                target = self._representative(int(self._out_targets[offset]), cluster)
+                if target is None:
+                    counts = external.setdefault(source, {'out': 0, 'in': 0})
+                    counts['out'] += 1
+                elif target != source:
+                    edge = edges.setdefault((source, target), {'source': source, 'target': target, 'count': 0,
+                                                               'types': {}})
+                    edge['count'] += 1
+                    edge_type = self._strings[self._out_types[offset]]
+                    edge['types'][edge_type] = edge['types'].get(edge_type, 0) + 1
+            for offset in range(self._in_offsets[position], self._in_offsets[position + 1]):
+                if self._representative(int(self._in_sources[offset]), cluster) is None:
+                    counts = external.setdefault(source, {'out': 0, 'in': 0})
+                    counts['in'] += 1
+
+        return {
+            'cluster': cluster.summary(),
+            'clusters': [child.summary() for child in sorted(cluster.children.values(), key=lambda c: c.label)],
+            'nodes': [self._node_dict(position) for position in cluster.leaves],
+            'edges': list(edges.values()),
+            'external': external  # item id -> edges to / from outside this cluster
+        }
+
+    def view(self, cluster_id=None, leaf_limit=500):
+        """
+        The view of `cluster_id` (default: the root), listing at most `leaf_limit` of the nodes
+        directly in it; None if there is no such cluster.
+        """
+        cluster = self._clusters.get(cluster_id or self.root.id)
+        if cluster is None:
+            return None
+        view = self._views.get(cluster.id)
+        if view is None:
+            view = self._views[cluster.id] = self._build_view(cluster)
+
+        nodes = view['nodes']
+        if leaf_limit is not None and len(nodes) > leaf_limit:
+            return dict(view, nodes=nodes[:leaf_limit], truncated=len(nodes) - leaf_limit)
+        return dict(view, truncated=0)
+
+    def cluster_of(self, node_id):
+        """
+        Cluster ids from the root down to the cluster directly holding `node_id`, for expanding
+        straight to a node; None if the node is unknown.
+        """
+        if self._positions is None:
+            self._positions = {self.node_id(position): position for position in range(len(self._names))}
+        position = self._positions.get(node_id)
+        return None if position is None else [cluster.id for cluster in self._chains[position]]
@@ -0,0 +1,135 @@
+# Server-side force-directed layout of a DependencyGraph, in 2D or 3D.
+#
+# The layout keeps a position per node id and is updated from to_compact() exports:
+#   - the first update (or a relayout) places every node and runs the full simulation;
+#   - later updates keep the position of every node that is still there, drop removed nodes,
+#     seed each new node at the centroid of its already placed neighbours and relax only the
+#     new nodes, so existing nodes never move when connections come and go.
+# The forces are Fruchterman-Reingold's: edges pull their ends together, every node pushes the
+# others away. The push is computed against the centroids of a coarse grid of cells instead of
+# every other node, which keeps an iteration linear in the number of moving nodes, and a pull
+# towards the origin keeps loosely connected parts from drifting apart; the layout settles to a
+# radius of about sqrt(n).
+
+import numpy as np
+
+GRID_CELLS = {2: 8, 3: 4}  # cells per axis
+
+
+class GraphLayout:
+    def __init__(self, dimensions=2, iterations=50, incremental_iterations=20, seed=0):
+        if dimensions not in GRID_CELLS:
+            raise ValueError(f"Unsupported number of dimensions {dimensions}. Expected one of {list(GRID_CELLS)}.")
+        self.dimensions = dimensions
+        self.iterations = iterations
+        self.incremental_iterations = incremental_iterations
+        self.version = None  # graph version of the last update
+        self.ids = []  # node ids, in the order of the last to_compact() export
+        self.coordinates = np.zeros((0, dimensions))  # row per id
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, compact, relayout=False):
+        """
+        Brings the layout in line with `compact` (DependencyGraph.to_compact()); returns the
+        number of nodes that were placed.
+        """
+        strings = compact['strings']
+        ids = [strings[kind] + ":" + strings[qmgr] + "." + strings[name]
+               for kind, qmgr, name in zip(compact['node_kind'], compact['node_qmgr'], compact['node_name'])]
+        offsets = np.asarray(compact['out_offsets'], dtype=np.int64)
+        sources = np.repeat(np.arange(len(ids)), np.diff(offsets))
+        targets = np.asarray(compact['out_targets'], dtype=np.int64)
+
+        coordinates = np.zeros((len(ids), self.dimensions))
+        movable = np.ones(len(ids), dtype=bool)
+        if not relayout:
+            previous = dict(zip(self.ids, self.coordinates))
+            for position, node_id in enumerate(ids):
+                placed = previous.get(node_id)
+                if placed is not None:
+                    coordinates[position] = placed
+                    movable[position] = False
+
+        new = np.flatnonzero(movable)
+        if len(new):
+            self._seed(coordinates, movable, sources, targets)
+            if len(new) == len(ids):
+                self._relax(coordinates, movable, sources, targets, self.iterations, np.sqrt(len(ids)) / 10 + 1)
+            else:
+                self._relax(coordinates, movable, sources, targets, self.incremental_iterations, 1.0)
+
+        self.ids = ids
+        self.coordinates = coordinates
+        self.version = compact['version']
+        return len(new)
+
+    def _seed(self, coordinates, movable, sources, targets):
+        # new nodes start next to their placed neighbours, or anywhere within the current extent
+        scale = np.sqrt(max(len(coordinates), 1))
+        sums = np.zeros_like(coordinates)
+        counts = np.zeros(len(coordinates))
+        for ends, others in ((sources, targets), (targets, sources)):
+            placed = movable[ends] & ~movable[others]
+            np.add.at(sums, ends[placed], coordinates[others[placed]])
+            np.add.at(counts, ends[placed], 1)
+
+        new = np.flatnonzero(movable)
+        jitter = self._rng.uniform(-1, 1, (len(new), self.dimensions))
+        anchored = counts[new] > 0
+        coordinates[new] = jitter * scale
+        coordinates[new[anchored]] = sums[new[anchored]] / counts[new[anchored], None] + jitter[anchored]
+
+    def _scatter(self, indexes, values, size):
+        # sums rows of `values` into `size` rows by index (a faster np.add.at)
+        return np.stack([np.bincount(indexes, values[:, axis], minlength=size) for axis in range(self.dimensions)],
+                        axis=1)
+
+    def _relax(self, coordinates, movable, sources, targets, iterations, temperature):
+        k = 1.0  # ideal edge length
+        moving = np.flatnonzero(movable)
+        touches = movable[sources] | movable[targets]
+        edge_sources, edge_targets = sources[touches], targets[touches]
+
+        for iteration in range(iterations):
+            displacement = np.zeros_like(coordinates)
+
+            # repulsion from the mass of every grid cell: k^2 / d, pointing away from the cell centroid
+            centroids, masses = self._cells(coordinates)
+            delta = coordinates[moving, None, :] - centroids[None, :, :]
+            distance_squared = np.maximum((delta ** 2).sum(axis=2), 0.01)
+            displacement[moving] = (delta * (masses[None, :] * k * k / distance_squared)[:, :, None]).sum(axis=1)
+            displacement[moving] -= coordinates[moving]  # gravity, balancing the push at a radius of ~sqrt(n)
+
+            # attraction along edges: d^2 / k, pulling both ends together
+            delta = coordinates[edge_targets] - coordinates[edge_sources]
+            distance = np.maximum(np.linalg.norm(delta, axis=1), 0.01)
+            pull = delta * (distance / k)[:, None]
+            displacement += self._scatter(edge_sources, pull, len(coordinates))
+            displacement -= self._scatter(edge_targets, pull, len(coordinates))
+
+            # move the free nodes by at most the current temperature, cooling linearly
+            step = displacement[moving]
+            length = np.maximum(np.linalg.norm(step, axis=1), 1e-9)
+            limit = temperature * (1 - iteration / iterations)
+            coordinates[moving] += step * (np.minimum(length, limit) / length)[:, None]
+
+    def _cells(self, coordinates):
+        # (centroid per occupied cell, node count per occupied cell)
+        cells_per_axis = GRID_CELLS[self.dimensions]
+        low, high = coordinates.min(axis=0), coordinates.max(axis=0)
+        cell = np.floor((coordinates - low) / np.maximum(high - low, 1e-9) * (cells_per_axis - 1e-9)).astype(np.int64)
+        flat = np.ravel_multi_index(cell.T, (cells_per_axis,) * self.dimensions)
+        occupied, inverse, masses = np.unique(flat, return_inverse=True, return_counts=True)
+        return self._scatter(inverse.ravel(), coordinates, len(occupied)) / masses[:, None], masses
+
+    def to_dict(self, precision=3):
+        """
+        {'version', 'dimensions', 'ids': [node id], 'coordinates': flat [x0, y0(, z0), x1, ...]};
+        ids follow the node order of the to_compact() export of the same version.
+        """
+        return {
+            'version': self.version,
+            'dimensions': self.dimensions,
+            'ids': self.ids,
+            'coordinates': np.round(self.coordinates, precision).ravel().tolist()
+        }
@@ -0,0 +1,57 @@
+# Incremental reader for large mqweb JSON responses.
+#
+# mqweb answers object listings as {"queue": [ {...}, {...}, ... ]}. Instead of holding the
+# whole body as text, then as a dict tree, then as a list of objects, iter_array_items decodes
+# the array one element at a time as chunks arrive, so only the current chunk and the element
+# being decoded are in memory.
+
+import codecs
+import json
+import re
+
+_WHITESPACE_AND_COMMAS = re.compile(r'[\s,]*')
+_decoder = json.JSONDecoder()
+
+
+def iter_array_items(chunks, key):
+    """
+    Yields the elements of the top-level array stored under `key` from an iterable of
+    bytes/str chunks. Raises ValueError if the body ends before the array is closed.
+    """
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    array_start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    buffer = ''
+    in_array = False
+
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = text_decoder.decode(chunk)
+        buffer += chunk
+
+        if not in_array:
+            match = array_start.search(buffer)
+            if not match:
+                continue
+            buffer = buffer[match.end():]
+            in_array = True
+
+        pos = 0
+        while True:
+            pos = _WHITESPACE_AND_COMMAS.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == ']':
+                return
+            try:
+                item, pos_after = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # element is split across chunks; wait for the rest of it
+                break
+            pos = pos_after
+            yield item
+
+        buffer = buffer[pos:]
+
+    if not in_array:
+        raise ValueError(f"Response does not contain a '{key}' array.")
+    raise ValueError(f"Response ended before the '{key}' array was closed.")
@@ -1,24 +1,81 @@
 import requests
 import json
+import random
+import sys
+import threading
+import time
+from requests.adapters import HTTPAdapter
 from MQRestAPI.Queues import RemoteQueue, TransmissionQueue, AliasQueue, LocalQueue
 from MQRestAPI.QMGR import QueueManager
 from MQRestAPI.Channel import Channel
 from MQRestAPI.Messages import Message
 from MQRestAPI.Application import Application, ConnectedObject
+from MQRestAPI.JSONStream import iter_array_items
+from MQRestAPI.Query import MQSCQuery, FULL_PROFILES
+
+
+# REST endpoints shared by the synchronous Client and the asyncio AsyncClient
+LOGIN_ENDPOINT = "/ibmmq/rest/v1/login"
+QMGR_ENDPOINT = "/ibmmq/rest/v1/admin/qmgr/{qmgr}?attributes=*"
+MQSC_ENDPOINT = "/ibmmq/rest/v2/admin/action/qmgr/{qmgr}/mqsc"
+
+
+def mqsc_display_request(qualifier, name, parameters=None):
+    """
+    Builds the runCommandJSON body for an MQSC DISPLAY command, e.g. DISPLAY CHANNEL(*) ALL.
+    """
+    return MQSCQuery(qualifier, name=name, parameters=parameters).to_payload()
+
+
+def filter_system_applications(applications):
+    return [application for application in applications if application.appltype != "SYSTEM"]
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff for transient mqweb failures (connection errors, timeouts,
+    429/5xx gateway statuses). Every call gets an overall deadline that bounds the sum of
+    all attempts and backoff sleeps.
+    """
+
+    def __init__(self, max_attempts=4, backoff_base=0.2, backoff_max=5.0, deadline=30.0,
+                 retry_statuses=(429, 500, 502, 503, 504)):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def backoff(self, attempt):
+        # "full jitter": uniform in [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
 
 
 class Client:
-    def __init__(self, url, qmgr=None, username=None, password=None):
+    def __init__(self, url, qmgr=None, username=None, password=None, timeout=(5, 30), retry_policy=None,
+                 pool_connections=4, pool_maxsize=16):
         self.baseUrl = url
         self.qmgr = qmgr
         self.username = username
         self.password = password
+        # (connect, read) seconds for a single attempt
+        self.timeout = timeout
+        self.retry_policy = retry_policy if retry_policy else RetryPolicy()
         self.session = requests.Session()
         self.session.headers.update({'Accept': 'application/json', 'ibm-mq-rest-csrf-token': 'value'})
+
+        # keep-alive pool sized for concurrent Flask requests sharing this client; retries are ours, not urllib3's
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # bumped on every successful login so concurrent 401s trigger a single re-login
+        self._auth_lock = threading.Lock()
+        self._auth_generation = 0
         self.authenticate()
 
     def authenticate(self):
-        request_url = f"{self.baseUrl}/ibmmq/rest/v1/login"
+        request_url = self.baseUrl + LOGIN_ENDPOINT
         body = json.dumps({"username": self.username, "password": self.password})
 
         try:
@@ -30,18 +87,73 @@ class Client:
         except requests.RequestException as e:
             raise Exception(f"Authentication request failed: {str(e)}")
 
+        self._auth_generation += 1
+
+    def reauthenticate(self, seen_generation):
+        """
+        Logs in again after a 401 (expired LTPA token), unless another thread already did so
+        since the failing request was sent.
+        """
+        with self._auth_lock:
+            if self._auth_generation == seen_generation:
+                self.authenticate()
+
     def get_queue_manager_name(self):
         return self.qmgr
 
-    def get_request(self, endpoint):
-        response = self.session.get(self.baseUrl + endpoint)
-        response.raise_for_status()
-        return response.text
+    def send_request(self, method, endpoint, deadline=None, **kwargs):
+        """
+        Sends a request with per-attempt timeouts, jittered exponential backoff on transient errors
+        and one transparent re-login on 401. deadline overrides the policy's overall deadline (seconds).
+        """
+        policy = self.retry_policy
+        give_up_at = time.monotonic() + (deadline if deadline is not None else policy.deadline)
+        reauthenticated = False
+        attempt = 0
+
+        while True:
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                raise requests.Timeout(f"Deadline exceeded for {method} {endpoint}")
+
+            connect_timeout, read_timeout = self.timeout
+            generation = self._auth_generation
+            try:
+                response = self.session.request(method, self.baseUrl + endpoint,
+                                                timeout=(min(connect_timeout, remaining), min(read_timeout, remaining)),
+                                                **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                attempt += 1
+                if attempt >= policy.max_attempts or give_up_at - time.monotonic() <= 0:
+                    raise
+                time.sleep(min(policy.backoff(attempt), max(0.0, give_up_at - time.monotonic())))
+                continue
+
+            if response.status_code == 401 and not reauthenticated:
+                # token expired: costs one login and one repeat of this request
+                response.close()  # hand the (possibly streamed) connection back to the pool
+                reauthenticated = True
+                self.reauthenticate(generation)
+                continue
+
+            if response.status_code in policy.retry_statuses and attempt + 1 < policy.max_attempts:
+                response.close()
+                attempt += 1
+                time.sleep(min(policy.backoff(attempt), max(0.0, give_up_at - time.monotonic())))
+                continue
+
+            if not response.ok:
+                response.close()
+            response.raise_for_status()
+            return response
+
+    def get_request(self, endpoint, deadline=None):
+        return self.send_request("GET", endpoint, deadline=deadline).text
 
-    def post_request(self, endpoint, json_payload):
-        response = self.session.post(self.baseUrl + endpoint, data=json_payload, headers={'Content-Type': 'application/json'})
-        response.raise_for_status()
-        return response.text
+    def post_request(self, endpoint, json_payload, deadline=None):
+        # only idempotent MQSC DISPLAY commands are posted, so retrying a POST is safe
+        return self.send_request("POST", endpoint, deadline=deadline, data=json_payload,
+                                 headers={'Content-Type': 'application/json'}).text
 
     def get_all_messages(self, queue):
         try:
@@ -74,13 +186,17 @@ class Client:
         return qmgrs
 
     def get_qmgr(self):
-        response = self.get_request(f"/ibmmq/rest/v1/admin/qmgr/{self.qmgr}?attributes=*")
+        response = self.get_request(QMGR_ENDPOINT.format(qmgr=self.qmgr))
         qmgr_json = json.loads(response)
         qmgrs = Parser.parse_qmgr_response(qmgr_json)
         return qmgrs[0]
 
-    def get_all_queues(self):
-        response = self.get_request(f"/ibmmq/rest/v1/admin/qmgr/{self.qmgr}/queue?attributes=*&status=*")
+    def get_all_queues(self, query=None):
+        """
+        query: optional Query.QueueQuery to project attributes and filter on the server (default: everything)
+        """
+        query = query if query else FULL_PROFILES["queue"]
+        response = self.get_request(query.to_endpoint(self.qmgr))
 
         queue_json = json.loads(response)
 
@@ -95,6 +211,24 @@ class Client:
 
         return queues
 
+    def iter_all_queues(self, chunk_size=64 * 1024, query=None):
+        """
+        Streaming variant of get_all_queues: parses the response incrementally and yields Queue
+        objects while the body is still downloading, instead of materialising text, dict tree and
+        list all at once.
+        """
+        yield from Parser.iter_queues(self.iter_all_queue_jsons(chunk_size=chunk_size, query=query))
+
+    def iter_all_queue_jsons(self, chunk_size=64 * 1024, query=None):
+        """
+        Yields the raw JSON object of each queue from a streamed listing, for callers that
+        parse selectively (see Monitoring.DeltaEngine).
+        """
+        query = query if query else FULL_PROFILES["queue"]
+        response = self.send_request("GET", query.to_endpoint(self.qmgr), stream=True)
+        with response:
+            yield from iter_array_items(response.iter_content(chunk_size=chunk_size), 'queue')
+
     def get_queue(self, queue):
         response = self.get_request(f"/ibmmq/rest/v1/admin/qmgr/{self.qmgr}/queue/{queue}?attributes=*&status=*")
         queue_json = json.loads(response)
@@ -104,65 +238,38 @@ class Client:
 
 
     def get_channel(self, channel):
-        json_request = json.dumps({
-            "type": "runCommandJSON",
-            "command": "display",
-            "qualifier": "channel",
-            "name": channel,
-            "responseParameters": ["all"],
-            "parameters": {}
-        })
-        response = self.post_request(f"/ibmmq/rest/v2/admin/action/qmgr/{self.qmgr}/mqsc", json_request)
+        json_request = mqsc_display_request("channel", channel)
+        response = self.post_request(MQSC_ENDPOINT.format(qmgr=self.qmgr), json_request)
         channel_json = json.loads(response)
         channels = Parser.parse_channel_response(channel_json)
         return channels[0]
 
-    def get_all_channels(self):
-        json_request = json.dumps({
-            "type": "runCommandJSON",
-            "command": "display",
-            "qualifier": "channel",
-            "name": "*",
-            "responseParameters": ["all"],
-            "parameters": {}
-        })
-        response = self.post_request(f"/ibmmq/rest/v2/admin/action/qmgr/{self.qmgr}/mqsc", json_request)
+    def get_all_channels(self, query=None):
+        json_request = (query if query else FULL_PROFILES["channel"]).to_payload()
+        response = self.post_request(MQSC_ENDPOINT.format(qmgr=self.qmgr), json_request)
         channels_json = json.loads(response)
         channels = Parser.parse_channel_response(channels_json)
         return channels
 
     def get_application(self, application):
-        json_request = json.dumps({
-            "type": "runCommandJSON",
-            "command": "display",
-            "qualifier": "conn",
-            "name": application,
-            "responseParameters": ["all"],
-            "parameters": {
-                "type": "*"
-            }
-        })
-        response = self.post_request(f"/ibmmq/rest/v2/admin/action/qmgr/{self.qmgr}/mqsc", json_request)
+        json_request = mqsc_display_request("conn", application, {"type": "*"})
+        response = self.post_request(MQSC_ENDPOINT.format(qmgr=self.qmgr), json_request)
         applications_json = json.loads(response)
         applications = Parser.parse_application_response(applications_json)
         return applications[0]
 
-    def get_all_applications(self):
-        json_request = json.dumps({
-            "type": "runCommandJSON",
-            "command": "display",
-            "qualifier": "conn",
-            "name": "*",
-            "responseParameters": ["all"],
-            "parameters": {
-                "type": "*"
-            }
-        })
-        response = self.post_request(f"/ibmmq/rest/v2/admin/action/qmgr/{self.qmgr}/mqsc", json_request)
+    def get_all_applications(self, query=None):
+        json_request = (query if query else FULL_PROFILES["conn"]).to_payload()
+        response = self.post_request(MQSC_ENDPOINT.format(qmgr=self.qmgr), json_request)
         applications_json = json.loads(response)
         applications = Parser.parse_application_response(applications_json)  # modified this line
-        filtered_applications = [application for application in applications if application.appltype != "SYSTEM"]
-        return filtered_applications
+        return filter_system_applications(applications)
+
+
+def _intern(value):
+    # connection listings repeat the same few channel/type/state strings (and queue names) on every
+    # row; interning keeps one copy of each instead of one per connection
+    return sys.intern(value) if isinstance(value, str) else value
 
 
 class Parser:
@@ -191,56 +298,67 @@ class Parser:
 
     @staticmethod
     def parse_queue_response(queue_response_json):
-        queues = []
+        return list(Parser.iter_queues(queue_response_json['queue']))
 
-        for queue_json in queue_response_json['queue']:
-            if "SYSTEM" in queue_json['name'] or "ADMIN" in queue_json['name']:
-                continue
+    @staticmethod
+    def iter_queues(queue_jsons):
+        """
+        Lazily parses an iterable of queue JSON objects, skipping SYSTEM/ADMIN and unsupported queues.
+        """
+        for queue_json in queue_jsons:
+            queue = Parser.parse_queue(queue_json)
+            if queue is not None:
+                yield queue
 
-            queue_type = queue_json['type']
-            if queue_type == 'alias':
-                queue = AliasQueue()
-                queue.target_queue_name = queue_json['alias']['targetName']
-                queue.type_name = 'Alias'
-                queue.inhibit_get = queue_json['general']['inhibitGet']
-            elif queue_type == 'remote':
-                queue = RemoteQueue()
-                queue.target_queue_name = queue_json['remote']['queueName']
-                queue.target_qmgr_name = queue_json['remote']['qmgrName']
-                queue.transmission_queue_name = queue_json['remote']['transmissionQueueName']
-                queue.type_name = 'Remote'
-            elif queue_type == 'local':
-                if queue_json['general']['isTransmissionQueue']:
-                    queue = TransmissionQueue()
-                    queue.current_depth = queue_json['status']['currentDepth']
-                    queue.max_number_of_messages = queue_json['storage']['maximumDepth']
-                    queue.max_message_length = queue_json['storage']['maximumMessageLength']
-                    queue.time_created = queue_json['timestamps']['created']
-                    queue.threshold = (queue.current_depth / queue.max_number_of_messages) * 100
-                    queue.inhibit_get = queue_json['general']['inhibitGet']
-                    queue.type_name = 'Transmission'
-                else:
-                    queue = LocalQueue()
-                    queue.current_depth = queue_json['status']['currentDepth']  # might break
-                    queue.max_number_of_messages = queue_json['storage']['maximumDepth']
-                    queue.max_message_length = queue_json['storage']['maximumMessageLength']
-                    queue.time_created = queue_json['timestamps']['created']
-                    queue.threshold = (queue.current_depth / queue.max_number_of_messages) * 100
-                    queue.inhibit_get = queue_json['general']['inhibitGet']
-                    queue.type_name = 'Local'
+    @staticmethod
+    def parse_queue(queue_json):
+        # Sections may be missing when the query projected attributes (see Query.QUEUE_PROFILES)
+        if "SYSTEM" in queue_json['name'] or "ADMIN" in queue_json['name']:
+            return None
+
+        general = queue_json.get('general', {})
+        storage = queue_json.get('storage', {})
+        status = queue_json.get('status', {})
+        timestamps = queue_json.get('timestamps', {})
+
+        queue_type = queue_json['type']
+        if queue_type == 'alias':
+            queue = AliasQueue()
+            queue.target_queue_name = queue_json.get('alias', {}).get('targetName')
+            queue.type_name = 'Alias'
+            queue.inhibit_get = general.get('inhibitGet')
+        elif queue_type == 'remote':
+            remote = queue_json.get('remote', {})
+            queue = RemoteQueue()
+            queue.target_queue_name = remote.get('queueName')
+            queue.target_qmgr_name = remote.get('qmgrName')
+            queue.transmission_queue_name = remote.get('transmissionQueueName')
+            queue.type_name = 'Remote'
+        elif queue_type == 'local':
+            if general.get('isTransmissionQueue'):
+                queue = TransmissionQueue()
+                queue.type_name = 'Transmission'
             else:
-                continue
-
-            queue.queue_name = queue_json['name']
-            queue.inhibit_put = queue_json['general']['inhibitPut']
-            queue.description = queue_json['general']['description']
-            queue.time_altered = queue_json['timestamps']['altered']
-
-
-            queues.append(queue)
+                queue = LocalQueue()
+                queue.type_name = 'Local'
+            queue.current_depth = status.get('currentDepth')
+            queue.max_number_of_messages = storage.get('maximumDepth')
+            queue.max_message_length = storage.get('maximumMessageLength')
+            queue.time_created = _intern(timestamps.get('created'))
+            queue.inhibit_get = general.get('inhibitGet')
+            if queue.current_depth is not None and queue.max_number_of_messages:
+                queue.threshold = (queue.current_depth / queue.max_number_of_messages) * 100
+            else:
+                queue.threshold = None
+        else:
+            return None
 
+        queue.queue_name = queue_json['name']
+        queue.inhibit_put = general.get('inhibitPut')
+        queue.description = general.get('description')
+        queue.time_altered = _intern(timestamps.get('altered'))
 
-        return queues
+        return queue
 
     @staticmethod
     def parse_message_response(message_response_json):
@@ -272,6 +390,7 @@ class Parser:
             channel.maxMessageLength = channel_params.get('maxmsgl', "")
             channel.heartbeatInterval = channel_params.get('hbint', 0)
             channel.transportType = channel_params.get('trptype', "")
+            channel.transmissionQueueName = channel_params.get('xmitq')
 
             channels.append(channel)
 
@@ -282,15 +401,17 @@ class Parser:
         applications = []
         for application_json in application_response_json['commandResponse']:
 
-            conn = application_json['parameters']['conn']
-            channel = application_json['parameters']['channel']
-            appltype = application_json['parameters']['appltype']
-            appldesc = application_json['parameters']['appldesc']
-            appltag = application_json['parameters']['appltag']
-            conname = application_json['parameters']['conname']
-            connopts = application_json['parameters']['connopts']
-            conntag = application_json['parameters']['conntag']
-            appl_objects = application_json['parameters']['objects'] if 'objects' in application_json['parameters'] else None
+            # .get: only conn is guaranteed when responseParameters were projected
+            params = application_json['parameters']
+            conn = params['conn']
+            channel = _intern(params.get('channel'))
+            appltype = _intern(params.get('appltype'))
+            appldesc = params.get('appldesc')
+            appltag = _intern(params.get('appltag'))
+            conname = params.get('conname')
+            connopts = params.get('connopts')
+            conntag = params.get('conntag')
+            appl_objects = params.get('objects')
 
             connected_objects = []
             if appl_objects:
@@ -301,10 +422,10 @@ class Parser:
                     else:
                         openopts = None
                     connected_object = ConnectedObject(
-                        obj['objname'],
-                        obj['objtype'],
-                        obj['hstate'],
-                        obj['reada'],
+                        _intern(obj['objname']),
+                        _intern(obj['objtype']),
+                        _intern(obj['hstate']),
+                        _intern(obj['reada']),
                         openopts
                     )
                     connected_objects.append(connected_object)
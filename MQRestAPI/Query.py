@@ -0,0 +1,115 @@
+# Attribute projection and server-side filtering for MQ object queries.
+#
+# By default every fetch asks mqweb for every attribute of every object (attributes=*,
+# responseParameters: ["all"]) and the Parser throws most of it away. A query names the
+# attributes it needs and pushes name/type filters into the REST/MQSC request instead, so the
+# queue manager does the filtering and the response only carries what the caller will read.
+
+import json
+from urllib.parse import urlencode
+
+
+class QueueQuery:
+    """
+    Query for the REST admin queue resource (GET /ibmmq/rest/v1/admin/qmgr/{qmgr}/queue).
+
+    name:       generic queue name, e.g. "DEV.*"
+    queue_type: "all", "local", "alias", "remote" or "model"
+    attributes: REST attribute names, e.g. ("storage.maximumDepth",); ("*",) for all, () for name/type only
+    status:     status attribute names, e.g. ("status.currentDepth",); ("*",) for all, () for none
+    """
+
+    def __init__(self, name="*", queue_type="all", attributes=("*",), status=("*",)):
+        self.name = name
+        self.queue_type = queue_type
+        self.attributes = tuple(attributes)
+        self.status = tuple(status)
+
+    def with_filters(self, name=None, queue_type=None):
+        return QueueQuery(name=name or self.name, queue_type=queue_type or self.queue_type,
+                          attributes=self.attributes, status=self.status)
+
+    def is_full(self):
+        return self.name == "*" and self.queue_type == "all" and self.attributes == ("*",) and self.status == ("*",)
+
+    def to_endpoint(self, qmgr):
+        params = {}
+        if self.name != "*":
+            params["name"] = self.name
+        if self.queue_type != "all":
+            params["type"] = self.queue_type
+        if self.attributes:
+            params["attributes"] = ",".join(self.attributes)
+        if self.status:
+            params["status"] = ",".join(self.status)
+
+        endpoint = f"/ibmmq/rest/v1/admin/qmgr/{qmgr}/queue"
+        if params:
+            endpoint += "?" + urlencode(params, safe="*,.")
+        return endpoint
+
+
+class MQSCQuery:
+    """
+    Query sent as an MQSC DISPLAY command through runCommandJSON.
+
+    qualifier:           "channel", "conn", ...
+    name:                generic object name, e.g. "DEV.*"
+    response_parameters: MQSC attribute names to return, ("all",) for everything
+    parameters:          MQSC filter keywords, e.g. {"chltype": "SDR"} or {"type": "*"} for conns
+    """
+
+    def __init__(self, qualifier, name="*", response_parameters=("all",), parameters=None):
+        self.qualifier = qualifier
+        self.name = name
+        self.response_parameters = tuple(response_parameters)
+        self.parameters = dict(parameters) if parameters else {}
+
+    def with_filters(self, name=None, parameters=None):
+        merged_parameters = dict(self.parameters)
+        merged_parameters.update(parameters or {})
+        return MQSCQuery(self.qualifier, name=name or self.name, response_parameters=self.response_parameters,
+                         parameters=merged_parameters)
+
+    def is_full(self):
+        return self.name == "*" and self.response_parameters == ("all",) and \
+            self.parameters == FULL_PROFILES[self.qualifier].parameters
+
+    def to_payload(self):
+        return json.dumps({
+            "type": "runCommandJSON",
+            "command": "display",
+            "qualifier": self.qualifier,
+            "name": self.name,
+            "responseParameters": list(self.response_parameters),
+            "parameters": self.parameters
+        })
+
+
+FULL_PROFILES = {
+    "queue": QueueQuery(),
+    "channel": MQSCQuery("channel"),
+    "conn": MQSCQuery("conn", parameters={"type": "*"}),
+}
+
+# Light profiles for the hot polling path.
+#   depth: local (incl. transmission) queues with just what the threshold checks need
+#   names: object names and types only
+QUEUE_PROFILES = {
+    "full": FULL_PROFILES["queue"],
+    "depth": QueueQuery(queue_type="local",
+                        attributes=("general.isTransmissionQueue", "storage.maximumDepth"),
+                        status=("status.currentDepth",)),
+    "names": QueueQuery(attributes=(), status=()),
+}
+
+CHANNEL_PROFILES = {
+    "full": FULL_PROFILES["channel"],
+    "names": MQSCQuery("channel", response_parameters=("chltype",)),
+}
+
+# appltype is always requested because SYSTEM connections are filtered out on the client
+APPLICATION_PROFILES = {
+    "full": FULL_PROFILES["conn"],
+    "names": MQSCQuery("conn", response_parameters=("appltype", "channel"), parameters={"type": "*"}),
+}
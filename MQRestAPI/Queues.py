@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
 
+# Queue objects are slotted, since a snapshot can hold tens of thousands of them and several
+# snapshots are cached in-process. to_dict spells out each field, which is the cheapest way to
+# build a fresh dict, rather than handing out live instance state.
+#
 # self.inhibit_get = None
 # self.time_created = None
 # self.max_number_of_messages = None
@@ -7,25 +11,36 @@ from abc import ABC, abstractmethod
 # self.current_depth = None
 # self.holds_messages = None
 class Queue(ABC):
+    __slots__ = ('queue_name', 'type_name', 'inhibit_put', 'description', 'time_altered')
+    TYPE_NAME = None
+
     def __init__(self):
         self.queue_name = None
-        self.type_name = None
+        self.type_name = self.TYPE_NAME
         self.inhibit_put = None
         self.description = None
         self.time_altered = None
+
     @abstractmethod
     def get_type_name(self):
         pass
 
     def to_dict(self):
-        return self.__dict__
+        return {
+            'queue_name': self.queue_name,
+            'type_name': self.type_name,
+            'inhibit_put': self.inhibit_put,
+            'description': self.description,
+            'time_altered': self.time_altered
+        }
 
     def __str__(self):
-        return str(self.__dict__)
+        return str(self.to_dict())
 
 
 class RemoteQueue(Queue):
-    type_name = "Remote"
+    __slots__ = ('target_queue_name', 'target_qmgr_name', 'transmission_queue_name')
+    TYPE_NAME = "Remote"
 
     def __init__(self):
         super().__init__()
@@ -35,11 +50,25 @@ class RemoteQueue(Queue):
 
 
     def get_type_name(self):
-        return RemoteQueue.type_name
+        return RemoteQueue.TYPE_NAME
+
+    def to_dict(self):
+        return {
+            'queue_name': self.queue_name,
+            'type_name': self.type_name,
+            'inhibit_put': self.inhibit_put,
+            'description': self.description,
+            'time_altered': self.time_altered,
+            'target_queue_name': self.target_queue_name,
+            'target_qmgr_name': self.target_qmgr_name,
+            'transmission_queue_name': self.transmission_queue_name
+        }
 
 
 class TransmissionQueue(Queue):
-    type_name = "Transmission"
+    __slots__ = ('current_depth', 'max_number_of_messages', 'max_message_length', 'inhibit_get', 'time_created',
+                 'threshold')
+    TYPE_NAME = "Transmission"
 
     def __init__(self):
         super().__init__()
@@ -48,24 +77,55 @@ class TransmissionQueue(Queue):
         self.max_message_length = None
         self.inhibit_get = None
         self.time_created = None
+        self.threshold = None
 
     def get_type_name(self):
-        return TransmissionQueue.type_name
+        return TransmissionQueue.TYPE_NAME
+
+    def to_dict(self):
+        return {
+            'queue_name': self.queue_name,
+            'type_name': self.type_name,
+            'inhibit_put': self.inhibit_put,
+            'description': self.description,
+            'time_altered': self.time_altered,
+            'current_depth': self.current_depth,
+            'max_number_of_messages': self.max_number_of_messages,
+            'max_message_length': self.max_message_length,
+            'inhibit_get': self.inhibit_get,
+            'time_created': self.time_created,
+            'threshold': self.threshold
+        }
 
 
 class AliasQueue(Queue):
-    type_name = "Alias"
+    __slots__ = ('target_queue_name', 'inhibit_get')
+    TYPE_NAME = "Alias"
 
     def __init__(self):
         super().__init__()
         self.target_queue_name = None
+        self.inhibit_get = None
 
     def get_type_name(self):
-        return AliasQueue.type_name
+        return AliasQueue.TYPE_NAME
+
+    def to_dict(self):
+        return {
+            'queue_name': self.queue_name,
+            'type_name': self.type_name,
+            'inhibit_put': self.inhibit_put,
+            'description': self.description,
+            'time_altered': self.time_altered,
+            'target_queue_name': self.target_queue_name,
+            'inhibit_get': self.inhibit_get
+        }
 
 
 class LocalQueue(Queue):
-    type_name = "Local"
+    __slots__ = ('current_depth', 'max_number_of_messages', 'max_message_length', 'inhibit_get', 'time_created',
+                 'threshold')
+    TYPE_NAME = "Local"
 
     def __init__(self):
         super().__init__()
@@ -74,7 +134,23 @@ class LocalQueue(Queue):
         self.max_message_length = None
         self.inhibit_get = None
         self.time_created = None
+        self.threshold = None
 
 
     def get_type_name(self):
-        return LocalQueue.type_name
+        return LocalQueue.TYPE_NAME
+
+    def to_dict(self):
+        return {
+            'queue_name': self.queue_name,
+            'type_name': self.type_name,
+            'inhibit_put': self.inhibit_put,
+            'description': self.description,
+            'time_altered': self.time_altered,
+            'current_depth': self.current_depth,
+            'max_number_of_messages': self.max_number_of_messages,
+            'max_message_length': self.max_message_length,
+            'inhibit_get': self.inhibit_get,
+            'time_created': self.time_created,
+            'threshold': self.threshold
+        }
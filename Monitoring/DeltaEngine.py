@@ -0,0 +1,187 @@
+# The delta engine keeps the last queue snapshot and turns each new queue listing into a
+# versioned set of added / removed / changed queues.
+#
+# Queue definitions rarely change, only their depth moves. A queue whose timestamps.altered
+# matches the previous snapshot is therefore not re-parsed: the existing Queue object is
+# reused while its status is unchanged, and copied with the new current depth / threshold when
+# it moved. Queue objects are never modified once published, since earlier snapshots and the
+# indexes built from them still hold them.
+# Serialised dicts are cached per queue and only rebuilt for queues that actually changed.
+
+import copy
+from collections import deque
+from threading import Lock
+from MQRestAPI.MQ import Parser
+
+
+class QueueDelta:
+    def __init__(self, version, added, removed, changed):
+        self.version = version
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def is_empty(self):
+        return not (self.added or self.removed or self.changed)
+
+
+class _Entry:
+    __slots__ = ("queue", "as_dict")
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.as_dict = queue.to_dict()
+
+
+def _refresh_status(queue, queue_json):
+    """
+    For an unchanged definition: a copy of `queue` carrying the new status, or None if the
+    status did not move.
+    """
+    if not hasattr(queue, 'current_depth'):
+        return None  # alias / remote queues carry no status
+
+    current_depth = queue_json.get('status', {}).get('currentDepth')
+    if current_depth == queue.current_depth:
+        return None
+
+    refreshed = copy.copy(queue)
+    refreshed.current_depth = current_depth
+    if current_depth is not None and queue.max_number_of_messages:
+        refreshed.threshold = (current_depth / queue.max_number_of_messages) * 100
+    else:
+        refreshed.threshold = None
+    return refreshed
+
+
+class QueueDeltaEngine:
+    def __init__(self, history_size=256):
+        self.version = 0
+        self._entries = {}  # queue name -> _Entry, in listing order
+        self._history = deque(maxlen=history_size)  # QueueDelta per version, oldest first
+        self._lock = Lock()  # guards version / _entries / _history for readers
+        self._update_lock = Lock()  # serialises updates so every delta is computed against its predecessor
+
+    def update(self, queue_jsons, on_queue=None):
+        """
+        Applies a full queue listing (iterable of raw queue JSON objects, e.g. from
+        Client.iter_all_queue_jsons) and returns the resulting QueueDelta. on_queue, if given,
+        is called with every current Queue as soon as it is available.
+        """
+        with self._update_lock:
+            with self._lock:
+                previous = self._entries
+
+            entries = {}
+            added, changed = [], []
+            for queue_json in queue_jsons:
+                name = queue_json['name']
+                entry = previous.get(name)
+
+                altered = queue_json.get('timestamps', {}).get('altered')
+                if entry is not None and altered is not None and altered == entry.queue.time_altered:
+                    refreshed = _refresh_status(entry.queue, queue_json)
+                    if refreshed is not None:
+                        entry = _Entry(refreshed)
+                        changed.append(name)
+                else:
+                    queue = Parser.parse_queue(queue_json)
+                    if queue is None:
+                        continue
+                    if entry is None:
+                        added.append(name)
+                    else:
+                        changed.append(name)
+                    entry = _Entry(queue)
+
+                entries[name] = entry
+                if on_queue:
+                    on_queue(entry.queue)
+
+            removed = [name for name in previous if name not in entries]
+
+            with self._lock:
+                self.version += 1
+                delta = QueueDelta(self.version, added, removed, changed)
+                self._entries = entries
+                self._history.append(delta)
+            return delta
+
+    def update_from_response(self, queue_response_json, on_queue=None):
+        return self.update(queue_response_json['queue'], on_queue)
+
+    def queues(self):
+        with self._lock:
+            return [entry.queue for entry in self._entries.values()]
+
+    def queue_dicts(self):
+        with self._lock:
+            return [entry.as_dict for entry in self._entries.values()]
+
+    def _net_changes(self, since):
+        # (version, entries, {name: existed at `since`}), the last None if `since` needs a full resync
+        with self._lock:
+            entries = self._entries
+            version = self.version
+            oldest_retained = self._history[0].version if self._history else version + 1
+
+            if since is None or since > version or since < oldest_retained - 1:
+                return version, entries, None
+
+            # existed_at_since[name]: whether the queue existed at version `since`, judged by its first event after it
+            existed_at_since = {}
+            for delta in self._history:
+                if delta.version <= since:
+                    continue
+                for name in delta.added:
+                    existed_at_since.setdefault(name, False)
+                for name in delta.changed:
+                    existed_at_since.setdefault(name, True)
+                for name in delta.removed:
+                    existed_at_since.setdefault(name, True)
+            return version, entries, existed_at_since
+
+    def changes_since(self, since):
+        """
+        Net changes between version `since` and now as a JSON-ready dict. If `since` is unknown
+        (None, from before the retained history, or from a previous server run) the result is a
+        full resync: 'full' is True and every current queue is listed under 'added'.
+        """
+        version, entries, existed_at_since = self._net_changes(since)
+        if existed_at_since is None:
+            return {'version': version, 'full': True, 'added': [entry.as_dict for entry in entries.values()],
+                    'changed': [], 'removed': []}
+
+        added, changed, removed = [], [], []
+        for name, existed in existed_at_since.items():
+            entry = entries.get(name)
+            if entry is not None:
+                (changed if existed else added).append(entry.as_dict)
+            elif existed:
+                removed.append(name)
+
+        return {'version': version, 'full': False, 'added': added, 'changed': changed, 'removed': removed}
+
+    def queue_changes_since(self, since):
+        """
+        The same net changes as Queue objects, for in-process consumers:
+        (version, full, [added or changed Queue], [removed name]). On a full resync every
+        current queue is in the first list and nothing is listed as removed.
+        """
+        version, entries, existed_at_since = self._net_changes(since)
+        if existed_at_since is None:
+            return version, True, [entry.queue for entry in entries.values()], []
+
+        upserted, removed = [], []
+        for name, existed in existed_at_since.items():
+            entry = entries.get(name)
+            if entry is not None:
+                upserted.append(entry.queue)
+            elif existed:
+                removed.append(name)
+        return version, False, upserted, removed
+
+    def clear(self):
+        with self._update_lock, self._lock:
+            self._entries = {}
+            self._history.clear()
@@ -0,0 +1,166 @@
+# Queue depth time series.
+#
+# Every snapshot is sampled at the same instant for all queues, so the history is kept as one
+# shared ring of sample times plus a (queues x capacity) matrix of depths: row = queue,
+# column = ring slot. Memory is fixed by `capacity` and the peak number of queues, however many
+# samples arrive or however long the server runs; rows of deleted queues are recycled.
+#
+# MQ only reports the instantaneous depth, so rates are derived from depth changes between
+# samples: fill_rate / drain_rate sum the rises / falls over the window (lower bounds on the
+# enqueue / dequeue rates, since puts and gets within one interval cancel out), and ewma_rate
+# smooths the net rate to tell a filling queue from a draining one and project time-to-full.
+
+import time
+from threading import Lock
+import numpy as np
+
+STEADY_RATE = 1e-6  # msgs/s below which a queue counts as steady
+
+
+class DepthHistory:
+    def __init__(self, capacity=60, alpha=0.3):
+        self.capacity = capacity
+        self.alpha = alpha  # EWMA weight of the newest interval
+        self._lock = Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._times = np.full(self.capacity, np.nan)
+            self._depths = np.full((0, self.capacity), np.nan)
+            self._max_depth = np.zeros(0)
+            self._ewma_rate = np.zeros(0)
+            self._rows = {}  # queue name -> row
+            self._free_rows = []
+            self._head = 0  # ring slot the next sample goes to
+            self._count = 0  # samples held, <= capacity
+
+    def _row_for(self, queue_name):
+        row = self._rows.get(queue_name)
+        if row is not None:
+            return row
+        if not self._free_rows:
+            self._grow()
+        row = self._free_rows.pop()
+        self._rows[queue_name] = row
+        return row
+
+    def _grow(self):
+        old_rows = len(self._depths)
+        new_rows = max(16, 2 * old_rows)
+        self._depths = np.vstack([self._depths, np.full((new_rows - old_rows, self.capacity), np.nan)])
+        self._max_depth = np.concatenate([self._max_depth, np.zeros(new_rows - old_rows)])
+        self._ewma_rate = np.concatenate([self._ewma_rate, np.full(new_rows - old_rows, np.nan)])
+        self._free_rows.extend(range(new_rows - 1, old_rows - 1, -1))
+
+    def _release(self, queue_name):
+        row = self._rows.pop(queue_name)
+        self._depths[row] = np.nan
+        self._max_depth[row] = 0
+        self._ewma_rate[row] = np.nan
+        self._free_rows.append(row)
+
+    def record(self, queues, timestamp=None):
+        """
+        Adds one sample for every queue in the snapshot that reports a depth. Queues missing
+        from the snapshot are dropped from the history.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        sampled = [queue for queue in queues
+                   if getattr(queue, 'current_depth', None) is not None and queue.max_number_of_messages]
+
+        with self._lock:
+            present = {queue.queue_name for queue in sampled}
+            for queue_name in [name for name in self._rows if name not in present]:
+                self._release(queue_name)
+
+            rows = np.fromiter((self._row_for(queue.queue_name) for queue in sampled), dtype=np.intp,
+                               count=len(sampled))
+            depths = np.fromiter((queue.current_depth for queue in sampled), dtype=np.float64, count=len(sampled))
+
+            slot = self._head
+            previous_slot = (slot - 1) % self.capacity
+            interval = timestamp - self._times[previous_slot] if self._count else np.nan
+
+            if interval > 0:
+                # NaN for queues that had no previous sample; their EWMA starts with the next interval
+                rate = (depths - self._depths[rows, previous_slot]) / interval
+                ewma = self._ewma_rate[rows]
+                updated = np.where(np.isnan(ewma), rate, self.alpha * rate + (1 - self.alpha) * ewma)
+                self._ewma_rate[rows] = np.where(np.isnan(rate), ewma, updated)
+
+            self._depths[:, slot] = np.nan
+            self._depths[rows, slot] = depths
+            self._max_depth[rows] = [queue.max_number_of_messages for queue in sampled]
+            self._times[slot] = timestamp
+            self._head = (slot + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def _window(self):
+        # ring slots from oldest to newest sample
+        return (self._head - self._count + np.arange(self._count)) % self.capacity
+
+    def _trends(self, names, rows):
+        window = self._window()
+        times = self._times[window]
+        depths = self._depths[np.ix_(rows, window)]
+
+        rises = np.diff(depths, axis=1)
+        intervals = np.broadcast_to(np.diff(times), rises.shape)
+        valid = ~np.isnan(rises)
+        span = np.where(valid, intervals, 0).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fill_rate = np.where(valid, np.clip(rises, 0, None), 0).sum(axis=1) / span
+            drain_rate = np.where(valid, np.clip(-rises, 0, None), 0).sum(axis=1) / span
+
+        current = depths[:, -1] if len(window) else np.full(len(rows), np.nan)
+        ewma_rate = self._ewma_rate[rows]
+        max_depth = self._max_depth[rows]
+        samples = (~np.isnan(depths)).sum(axis=1)
+
+        trends = {}
+        for i, queue_name in enumerate(names):
+            rate = ewma_rate[i]
+            if np.isnan(rate):
+                rate, direction, time_to_full = None, None, None
+            else:
+                direction = 'filling' if rate > STEADY_RATE else 'draining' if rate < -STEADY_RATE else 'steady'
+                time_to_full = round(float((max_depth[i] - current[i]) / rate), 1) if rate > STEADY_RATE else None
+                rate = round(float(rate), 3)
+            trends[queue_name] = {
+                'samples': int(samples[i]),
+                'fill_rate': None if np.isnan(fill_rate[i]) else round(float(fill_rate[i]), 3),
+                'drain_rate': None if np.isnan(drain_rate[i]) else round(float(drain_rate[i]), 3),
+                'ewma_rate': rate,
+                'trend': direction,
+                'time_to_full': time_to_full
+            }
+        return trends
+
+    def trends(self):
+        """
+        {queue name: trend dict} for every tracked queue, computed for all of them at once.
+        Rates are messages per second, time_to_full is in seconds (None unless filling).
+        """
+        with self._lock:
+            names = list(self._rows)
+            return self._trends(names, np.fromiter(self._rows.values(), dtype=np.intp, count=len(names)))
+
+    def trend(self, queue_name):
+        with self._lock:
+            row = self._rows.get(queue_name)
+            if row is None:
+                return None
+            return self._trends([queue_name], np.array([row]))[queue_name]
+
+    def samples(self, queue_name):
+        """
+        [[unix timestamp, depth], ...] from oldest to newest for one queue.
+        """
+        with self._lock:
+            row = self._rows.get(queue_name)
+            if row is None:
+                return None
+            window = self._window()
+            return [[float(t), int(d)] for t, d in zip(self._times[window], self._depths[row, window])
+                    if not np.isnan(d)]
@@ -0,0 +1,41 @@
+# Name-keyed lookups into the latest cached snapshot of each MQ object type.
+#
+# The flask cache pickles what it stores, so every cache.get('all_queues') unpickles the whole
+# snapshot before it can be searched. The index keeps the same objects in plain dicts, keyed the
+# way issues name them (queue name, channel name, connection id), so finding the object an
+# issue refers to is one dict lookup. Each update swaps in a complete new dict, so readers never
+# see a half-built index and need no lock.
+
+from threading import Lock
+
+# issue mqobjectType -> attribute holding the object's name
+NAME_ATTRIBUTES = {
+    'queue': 'queue_name',
+    'channel': 'channelName',
+    'application': 'conn'
+}
+
+
+class ObjectIndex:
+    def __init__(self):
+        self._indexes = {}  # object type -> {name: object}
+        self._lock = Lock()  # serialises writers only
+
+    def update(self, object_type, objects):
+        attribute = NAME_ATTRIBUTES[object_type]
+        index = {getattr(obj, attribute): obj for obj in objects if hasattr(obj, attribute)}
+        with self._lock:
+            indexes = dict(self._indexes)
+            indexes[object_type] = index
+            self._indexes = indexes
+
+    def get(self, object_type, name):
+        """
+        The cached object of `object_type` called `name`, or None if it (or the whole snapshot)
+        is not cached.
+        """
+        return self._indexes.get(object_type, {}).get(name)
+
+    def clear(self):
+        with self._lock:
+            self._indexes = {}
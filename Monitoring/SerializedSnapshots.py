@@ -0,0 +1,58 @@
+# Pre-serialised snapshot bodies for conditional GETs.
+#
+# Every distinct snapshot of an object type is rendered to JSON bytes once, and its ETag is the
+# digest of those bytes. Polls carrying a matching If-None-Match get a 304 straight from the
+# stored tag; other polls get the stored bytes. Neither re-serialises or reaches mqweb. A refresh
+# that produces identical content keeps the previous version and ETag, so clients only
+# re-download when something actually changed.
+
+import hashlib
+import json
+from threading import Lock
+
+
+class SerializedSnapshot:
+    __slots__ = ('source', 'version', 'etag', 'body')
+
+    def __init__(self, source, version, etag, body):
+        self.source = source  # the snapshot object this body was rendered from
+        self.version = version
+        self.etag = etag
+        self.body = body
+
+
+class SerializedSnapshotCache:
+    def __init__(self):
+        self._snapshots = {}  # object type -> SerializedSnapshot
+        self._versions = {}  # object type -> last version handed out, kept across clear()
+        self._lock = Lock()
+
+    def get(self, object_type, snapshot, render):
+        """
+        Returns the SerializedSnapshot of `snapshot`. render(snapshot) -> JSON-ready dict is
+        only called the first time a given snapshot object is seen.
+        """
+        current = self._snapshots.get(object_type)
+        if current is not None and current.source is snapshot:
+            return current
+
+        with self._lock:
+            current = self._snapshots.get(object_type)
+            if current is not None and current.source is snapshot:
+                return current  # rendered by another request while we waited
+
+            body = json.dumps(render(snapshot), separators=(',', ':')).encode('utf-8')
+            etag = f"{object_type}-{hashlib.blake2b(body, digest_size=12).hexdigest()}"
+            if current is not None and current.etag == etag:
+                version = current.version  # refreshed, but nothing changed
+            else:
+                version = self._versions.get(object_type, 0) + 1
+                self._versions[object_type] = version
+
+            serialized = SerializedSnapshot(snapshot, version, etag, body)
+            self._snapshots[object_type] = serialized
+            return serialized
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
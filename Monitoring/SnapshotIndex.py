@@ -0,0 +1,212 @@
+# Indexes over a cached object snapshot for paged, filtered and sorted list requests.
+#
+# A snapshot's rows (the dicts the list endpoints return) are indexed once, the first time a
+# page of that snapshot is asked for:
+#   - names sorted once, so a name prefix ("DEV.*") is two bisections instead of a scan
+#   - one boolean mask per object type
+#   - the depth percentage as a NumPy column, for the depth floor
+#   - one ascending order per sort key, built on first use
+# A page request combines masks, walks the chosen order from the cursor and serialises only the
+# rows it returns; each row's JSON is kept, so later pages and later callers reuse it.
+#
+# Cursors are keyset cursors (the sort key of the last row returned), so paging stays
+# consistent when the snapshot is refreshed between two page requests.
+
+import base64
+import json
+import re
+from bisect import bisect_left, bisect_right
+from fnmatch import translate
+from threading import Lock
+import numpy as np
+
+
+class IndexSpec:
+    """
+    Which row fields an object type is indexed on.
+
+    name_field:  unique object name, the tie-breaker of every sort order
+    type_field:  field matched by the type filter (case-insensitive)
+    depth_field: depth percentage field for the depth floor, None if the type has no depth
+    sort_fields: {sort parameter value: row field}
+    type_groups: {type filter value: types it covers}, for filters that span several row types
+    """
+
+    def __init__(self, name_field, type_field, depth_field=None, sort_fields=None, type_groups=None):
+        self.name_field = name_field
+        self.type_field = type_field
+        self.depth_field = depth_field
+        self.sort_fields = sort_fields or {'name': name_field}
+        self.type_groups = type_groups or {}
+
+
+QUEUE_INDEX = IndexSpec('queue_name', 'type_name', depth_field='threshold', sort_fields={
+    'name': 'queue_name', 'type': 'type_name', 'depth': 'current_depth', 'depth_pct': 'threshold',
+    'max_depth': 'max_number_of_messages', 'altered': 'time_altered'},
+    # as in mqweb, type=local also lists transmission queues
+    type_groups={'local': ('local', 'transmission')})
+
+CHANNEL_INDEX = IndexSpec('channel_name', 'channel_type', sort_fields={
+    'name': 'channel_name', 'type': 'channel_type'})
+
+APPLICATION_INDEX = IndexSpec('conn', 'appltype', sort_fields={
+    'name': 'conn', 'type': 'appltype', 'channel': 'channel', 'appltag': 'appltag', 'conname': 'conname'})
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Returns the sort key encoded in `cursor`; raises ValueError if it is not one of ours.
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not (isinstance(key, list) and len(key) == 3 and isinstance(key[0], bool) and isinstance(key[2], str)):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return tuple(key)
+
+
+class SnapshotIndex:
+    def __init__(self, rows, spec):
+        self.rows = rows
+        self.spec = spec
+        count = len(rows)
+
+        self.names = [row.get(spec.name_field) or '' for row in rows]
+        self._name_order = sorted(range(count), key=self.names.__getitem__)
+        self._sorted_names = [self.names[position] for position in self._name_order]
+
+        positions_by_type = {}
+        for position, row in enumerate(rows):
+            positions_by_type.setdefault(str(row.get(spec.type_field) or '').lower(), []).append(position)
+        self._type_masks = {}
+        for object_type, positions in positions_by_type.items():
+            mask = np.zeros(count, dtype=bool)
+            mask[positions] = True
+            self._type_masks[object_type] = mask
+        for group, object_types in spec.type_groups.items():
+            mask = np.zeros(count, dtype=bool)
+            for object_type in object_types:
+                mask |= self._type_masks.get(object_type, False)
+            self._type_masks[group] = mask
+
+        self.depth_pct = None
+        if spec.depth_field:
+            self.depth_pct = np.array([np.nan if row.get(spec.depth_field) is None else row[spec.depth_field]
+                                       for row in rows], dtype=np.float64)
+
+        self._orders = {}  # sort field -> (positions in ascending key order, ascending keys)
+        self._fragments = [None] * count  # serialised row JSON, filled on first use
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def sort_key(self, position, field):
+        # None sorts last; the name makes every key unique
+        value = self.rows[position].get(field)
+        return value is None, value, self.names[position]
+
+    def _order(self, field):
+        order = self._orders.get(field)
+        if order is None:
+            with self._lock:
+                order = self._orders.get(field)
+                if order is None:
+                    keys = [self.sort_key(position, field) for position in range(len(self.rows))]
+                    positions = sorted(range(len(keys)), key=keys.__getitem__)
+                    order = (np.array(positions, dtype=np.intp), [keys[position] for position in positions])
+                    self._orders[field] = order
+        return order
+
+    def _name_mask(self, name):
+        mask = np.zeros(len(self.rows), dtype=bool)
+        wildcard = re.search(r'[*?\[]', name)
+        if wildcard is None or (wildcard.start() == len(name) - 1 and name.endswith('*')):
+            # exact name or trailing-* prefix, as in MQ generic names: a range of the sorted names
+            prefix = name.rstrip('*')
+            start = bisect_left(self._sorted_names, prefix)
+            if wildcard is None:
+                end = bisect_right(self._sorted_names, prefix, lo=start)
+            else:
+                end = bisect_left(self._sorted_names, prefix + '\U0010ffff', lo=start)
+            mask[self._name_order[start:end]] = True
+        else:
+            match = re.compile(translate(name)).match
+            mask[[position for position, object_name in enumerate(self.names) if match(object_name)]] = True
+        return mask
+
+    def select(self, object_type=None, name=None, min_depth_pct=None, sort='name', descending=False,
+               limit=None, cursor=None):
+        """
+        Returns (row positions of the page, cursor for the next page or None, total matching rows).
+        `sort` is a key of the spec's sort_fields, `cursor` a value from a previous call.
+        """
+        mask = np.ones(len(self.rows), dtype=bool)
+        if object_type:
+            mask &= self._type_masks.get(object_type.lower(), np.zeros(len(self.rows), dtype=bool))
+        if name and name != '*':
+            mask &= self._name_mask(name)
+        if min_depth_pct is not None and self.depth_pct is not None:
+            with np.errstate(invalid='ignore'):
+                mask &= self.depth_pct >= min_depth_pct  # NaN (no depth) never passes
+
+        positions, keys = self._order(self.spec.sort_fields[sort])
+        cursor_key = decode_cursor(cursor) if cursor else None
+        try:
+            if descending:
+                end = bisect_left(keys, cursor_key) if cursor_key is not None else len(keys)
+                candidates = positions[:end][::-1]
+            else:
+                start = bisect_right(keys, cursor_key) if cursor_key is not None else 0
+                candidates = positions[start:]
+        except TypeError as e:
+            raise ValueError(f"Cursor does not belong to sort '{sort}'.") from e
+
+        selected = candidates[mask[candidates]]
+        page = selected if limit is None else selected[:limit]
+        next_cursor = None
+        if len(page) < len(selected):
+            next_cursor = encode_cursor(self.sort_key(int(page[-1]), self.spec.sort_fields[sort]))
+        return page.tolist(), next_cursor, int(mask.sum())
+
+    def fragments(self, positions):
+        """
+        Serialised JSON of the rows at `positions`, each row serialised at most once per snapshot.
+        """
+        fragments = self._fragments
+        for position in positions:
+            if fragments[position] is None:
+                fragments[position] = json.dumps(self.rows[position], separators=(',', ':'))
+        return [fragments[position] for position in positions]
+
+
+class SnapshotIndexCache:
+    def __init__(self):
+        self._indexes = {}  # object type -> (snapshot, SnapshotIndex)
+        self._lock = Lock()
+
+    def get(self, object_type, snapshot, rows, spec):
+        """
+        Returns the SnapshotIndex of `snapshot`; rows(snapshot) -> list of row dicts is only
+        called the first time a given snapshot object is seen.
+        """
+        current = self._indexes.get(object_type)
+        if current is not None and current[0] is snapshot:
+            return current[1]
+
+        with self._lock:
+            current = self._indexes.get(object_type)
+            if current is not None and current[0] is snapshot:
+                return current[1]
+            index = SnapshotIndex(rows(snapshot), spec)
+            self._indexes[object_type] = (snapshot, index)
+            return index
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
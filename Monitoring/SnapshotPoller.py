@@ -0,0 +1,142 @@
+# Background refreshing of MQ object snapshots with stale-while-revalidate serving.
+#
+# Each object type (queues, channels, ...) gets a BackgroundRefresher: a daemon thread that
+# calls its refresh function every `interval` seconds. HTTP handlers never talk to mqweb
+# themselves; they take the latest snapshot immediately and, if it is older than
+# `max_staleness`, wake the refresher so the next caller gets newer data. However many
+# dashboards poll, mqweb sees one request per object type per interval.
+
+import threading
+import time
+
+
+class BackgroundRefresher:
+    def __init__(self, name, refresh, interval, max_staleness=None):
+        self.name = name
+        self._refresh = refresh
+        self.interval = interval
+        self.max_staleness = max_staleness if max_staleness is not None else 2 * interval
+
+        self.value = None
+        self.refreshed_at = None  # time.monotonic() of the last successful refresh
+        self.last_error = None
+
+        self._trigger = threading.Event()
+        self._stopped = threading.Event()
+        self._refresh_lock = threading.Lock()  # single-flight: one refresh at a time per object type
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive() and not self._stopped.is_set():
+            return
+        # fresh stop event per thread, so a thread still finishing after stop() cannot be revived
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stopped,), name=f"refresher-{self.name}",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._trigger.set()
+
+    def clear(self):
+        with self._refresh_lock:
+            self.value = None
+            self.refreshed_at = None
+            self.last_error = None
+
+    def age(self):
+        return None if self.refreshed_at is None else time.monotonic() - self.refreshed_at
+
+    def get(self):
+        """
+        Returns the latest snapshot without waiting on mqweb. Only the very first call (no
+        snapshot yet) refreshes synchronously; a stale snapshot is served as is while a
+        background refresh is requested.
+        """
+        if self.refreshed_at is None:
+            self.refresh_now(only_if_empty=True)
+        elif self.age() > self.max_staleness:
+            self._trigger.set()
+        return self.value
+
+    def request_refresh(self):
+        self._trigger.set()
+
+    def refresh_now(self, only_if_empty=False):
+        with self._refresh_lock:
+            if only_if_empty and self.refreshed_at is not None:
+                return  # another caller filled it while we waited
+            try:
+                value = self._refresh()
+            except Exception as e:
+                self.last_error = str(e)
+                if only_if_empty:
+                    raise
+                return
+            if value is not None:
+                self.value = value
+                self.refreshed_at = time.monotonic()
+                self.last_error = None
+
+    def _run(self, stopped):
+        while not stopped.is_set():
+            self._trigger.wait(timeout=self.interval)
+            self._trigger.clear()
+            if stopped.is_set():
+                break
+            self.refresh_now()
+
+    def status(self):
+        return {
+            'interval': self.interval,
+            'max_staleness': self.max_staleness,
+            'age': self.age(),
+            'last_error': self.last_error
+        }
+
+
+class SnapshotPoller:
+    """
+    Owns one BackgroundRefresher per object type.
+
+    refreshers: {object_type: (refresh function, interval seconds[, max staleness seconds])}
+    A refresh function returns the new snapshot, or None to keep the current one (e.g. not logged in).
+    """
+
+    def __init__(self, refreshers):
+        self._refreshers = {}
+        for object_type, config in refreshers.items():
+            self._refreshers[object_type] = BackgroundRefresher(object_type, *config)
+
+    def start(self):
+        for refresher in self._refreshers.values():
+            refresher.start()
+
+    def stop(self):
+        for refresher in self._refreshers.values():
+            refresher.stop()
+
+    def clear(self):
+        for refresher in self._refreshers.values():
+            refresher.clear()
+
+    def get(self, object_type):
+        return self._refreshers[object_type].get()
+
+    def request_refresh(self, object_type):
+        self._refreshers[object_type].request_refresh()
+
+    def configure(self, object_type, interval=None, max_staleness=None):
+        refresher = self._refreshers[object_type]
+        if interval is not None:
+            refresher.interval = interval
+        if max_staleness is not None:
+            refresher.max_staleness = max_staleness
+        refresher.request_refresh()  # wake it so the new interval applies now
+
+    def object_types(self):
+        return list(self._refreshers)
+
+    def status(self):
+        return {object_type: refresher.status() for object_type, refresher in self._refreshers.items()}
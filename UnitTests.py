@@ -3,6 +3,14 @@ import time
 import urllib3
 import unittest
 
+from MQRestAPI.Application import Application, ConnectedObject
+from MQRestAPI.Channel import Channel
+from MQRestAPI.DependencyGraph import DependencyGraph, QUEUE, APPLICATION
+from MQRestAPI.GraphClusters import GraphClusters
+from MQRestAPI.GraphLayout import GraphLayout
+from MQRestAPI.Queues import AliasQueue, LocalQueue, RemoteQueue, TransmissionQueue
+from IssueLogging.AlertStates import QueueAlertStates, EXCEEDED
+
 # Suppress InsecureRequestWarning from urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -65,8 +73,8 @@ class QMgrSystemReport:
             print(f"Invalid JSON response from {url}")
             return None
 
-    def get_all_queues(self):
-        response = self.request_json("getallqueues")
+    def get_all_queues(self, trends=False):
+        response = self.request_json("getallqueues" + ("?trends=true" if trends else ""))
         if response:
             self.queues = response.get('All_Queues', [])
             print('Queues', self.queues)
@@ -86,6 +94,53 @@ class QMgrSystemReport:
             print('Channels', self.channels)
         return response
 
+    def get_snapshot(self):
+        response = self.request_json("getsnapshot")
+        if response:
+            snapshot = response.get('Snapshot', {})
+            self.queues = snapshot.get('All_Queues', [])
+            self.applications = snapshot.get('All_Applications', [])
+            self.channels = snapshot.get('All_Channels', [])
+            print('Snapshot', snapshot)
+        return response
+
+    def get_fan_out(self, object_type, merged=False):
+        response = self.request_json(f"fanout/{object_type}" + ("/merged" if merged else ""))
+        if response:
+            print('Fan-out', object_type, response)
+        return response
+
+    def get_changes(self, since=None):
+        response = self.request_json("changes" + (f"?since={since}" if since is not None else ""))
+        if response:
+            print('Changes', response)
+        return response
+
+    def get_queue_depth_history(self, queue_name=None):
+        response = self.request_json("queuedepthhistory" + (f"?queue={queue_name}" if queue_name else ""))
+        if response:
+            print('Queue Depth History', response)
+        return response
+
+    def poll_issues(self, cursor=None, timeout=1):
+        response = self.request_json("issues/poll?" + (f"cursor={cursor}&" if cursor is not None else "")
+                                     + f"timeout={timeout}")
+        if response:
+            print('Polled Issues', response)
+        return response
+
+    def get_queue_page(self, **params):
+        response = self.request_json("getallqueues?" + "&".join(f"{key}={value}" for key, value in params.items()))
+        if response:
+            print('Queue Page', response)
+        return response
+
+    def get_dependency_impact(self, queue_name):
+        response = self.request_json(f"dependencygraph/impact?name={queue_name}")
+        if response:
+            print('Dependency Impact', response)
+        return response
+
     def get_dependency_graph(self):
         response = self.request_json("getdependencygraph")
         if response:
@@ -392,6 +447,207 @@ class TestFlaskServer(unittest.TestCase):
         print(response)
         self.assertIn('relate to IBM MQ', response['message'], "Didn't give default message. ")
 
+    def test_12_get_snapshot(self):
+        response = self.report_service.get_snapshot()
+        self.assertIsNotNone(response)
+        self.assertTrue(self.report_service.queues)
+        self.assertEqual(response['Snapshot']['Queue_Manager']['qmgr_name'], qmgr)
+
+
+    def test_13_fan_out_queues(self):
+        response = self.report_service.get_fan_out("queues")
+        self.assertIsNotNone(response)
+        self.assertIn(qmgr, response['By_Queue_Manager'])
+
+        merged = self.report_service.get_fan_out("queues", merged=True)
+        self.assertTrue(all(queue['qmgr_name'] in response['By_Queue_Manager'] for queue in merged['Merged']))
+
+
+    def test_14_get_changes(self):
+        full = self.report_service.get_changes()
+        self.assertIsNotNone(full)
+        self.assertTrue(full['full'])
+
+        delta = self.report_service.get_changes(full['version'])
+        self.assertFalse(delta['full'])
+        self.assertGreater(delta['version'], full['version'])
+
+    def test_15_get_queue_depth_history(self):
+        trends = self.report_service.get_queue_depth_history()
+        self.assertIsNotNone(trends)
+        self.assertIn('Depth_Trends', trends)
+
+    def test_16_poll_issues(self):
+        first = self.report_service.poll_issues(cursor=0)
+        self.assertIsNotNone(first)
+        self.assertIn('cursor', first)
+
+        # polling again from the returned cursor does not repeat issues already delivered
+        second = self.report_service.poll_issues(cursor=first['cursor'], timeout=0)
+        self.assertGreaterEqual(second['cursor'], first['cursor'])
+
+    def test_17_page_queues(self):
+        first = self.report_service.get_queue_page(limit=2, sort="name")
+        self.assertIsNotNone(first)
+        self.assertLessEqual(len(first['All_Queues']), 2)
+
+        if first['next_cursor']:
+            second = self.report_service.get_queue_page(limit=2, sort="name", cursor=first['next_cursor'])
+            self.assertGreater(second['All_Queues'][0]['queue_name'], first['All_Queues'][-1]['queue_name'])
+
+    def test_18_dependency_impact(self):
+        queues = self.report_service.get_queue_page(limit=1)
+        self.assertIsNotNone(queues)
+        if queues['All_Queues']:
+            impact = self.report_service.get_dependency_impact(queues['All_Queues'][0]['queue_name'])
+            self.assertIsNotNone(impact)
+            self.assertEqual(impact['count'], len(impact['impacted']))
+
+    def test_19_compact_dependency_graph(self):
+        response = self.report_service.request_json("getdependencygraph?format=compact")
+        self.assertIsNotNone(response)
+        graph = response['Dependency Graph']
+        self.assertEqual(len(graph['out_offsets']), len(graph['node_name']) + 1)
+        self.assertEqual(graph['out_offsets'][-1], len(graph['out_targets']))
+
+    def test_20_get_all_queues_with_trends(self):
+        response = self.report_service.get_all_queues(trends=True)
+        self.assertIsNotNone(response)
+        self.assertTrue(response['All_Queues'])
+        self.assertTrue(all('depth_trend' in queue for queue in response['All_Queues']))
+
+        plain = self.report_service.get_all_queues()
+        self.assertTrue(all('depth_trend' not in queue for queue in plain['All_Queues']))
+
+
+
+# The graph structures below are pure, so these run without a server.
+def make_queue(queue_class, name, **fields):
+    queue = queue_class()
+    queue.queue_name = name
+    for field, value in fields.items():
+        setattr(queue, field, value)
+    return queue
+
+
+def make_application(conn, queue_names, channel="DEV.APP.SVRCONN"):
+    return Application(conn, channel, None, None, None, None, "USER", None, "myapp",
+                       [ConnectedObject(objname=name, objtype="QUEUE") for name in queue_names])
+
+
+class TestDependencyGraph(unittest.TestCase):
+
+    def test_01_to_dict_merges_same_named_nodes(self):
+        graph = DependencyGraph()
+        graph.create_dependency_graph(
+            [make_queue(RemoteQueue, "REMOTE.Q", target_queue_name="DEV.QUEUE.1", target_qmgr_name="QM2",
+                        transmission_queue_name="QM2"),
+             make_queue(TransmissionQueue, "QM2")],
+            [Channel("QM2", "SDR", transmissionQueueName="QM2")], [], "QM1")
+
+        as_dict = graph.to_dict()
+        self.assertEqual(as_dict['direct_dependencies']['QM1.QM2'], ["QM1.QM2"])
+        self.assertCountEqual(as_dict['indirect_dependencies']['QM1.QM2'], ["QM1.REMOTE.Q", "QM1.QM2"])
+        self.assertEqual(as_dict['implicit_dependencies'], {})
+
+    def test_02_remove_referenced_only_node(self):
+        graph = DependencyGraph()
+        graph.create_dependency_graph([make_queue(AliasQueue, "ALIAS.Q", target_queue_name="MISSING.Q")], [], [],
+                                      "QM1")
+        alias_id, missing_id = graph.node_id(QUEUE, "QM1", "ALIAS.Q"), graph.node_id(QUEUE, "QM1", "MISSING.Q")
+        self.assertEqual([node.id for node, _ in graph.upstream(missing_id)], [alias_id])
+
+        graph.remove_node(missing_id)
+        self.assertIsNone(graph.node(missing_id))
+        self.assertEqual(graph.downstream(alias_id), [])
+        self.assertEqual(len(graph), 1)
+
+    def test_03_incremental_updates_match_a_rebuild(self):
+        queues = [make_queue(LocalQueue, "DEV.QUEUE.1"),
+                  make_queue(AliasQueue, "ALIAS.Q", target_queue_name="DEV.QUEUE.1")]
+        graph = DependencyGraph()
+        graph.create_dependency_graph(queues, [], [make_application("C1", ["ALIAS.Q"])], "QM1")
+        application_id = graph.node_id(APPLICATION, "QM1", "C1")
+        self.assertEqual(len(graph.downstream(application_id)), 3)  # cached, then invalidated below
+
+        applications = [make_application("C2", ["DEV.QUEUE.1"])]
+        graph.sync(APPLICATION, "QM1", applications)
+        rebuilt = DependencyGraph()
+        rebuilt.create_dependency_graph(queues, [], applications, "QM1")
+        self.assertEqual(graph.to_dict(), rebuilt.to_dict())
+        self.assertIsNone(graph.downstream(application_id))
+
+    def test_04_cluster_views(self):
+        graph = DependencyGraph()
+        graph.create_dependency_graph([make_queue(LocalQueue, "DEV.QUEUE.1", current_depth=10),
+                                       make_queue(LocalQueue, "DEV.QUEUE.2", current_depth=5),
+                                       make_queue(LocalQueue, "DEV.OTHER.1", current_depth=1)],
+                                      [], [make_application("C1", ["DEV.QUEUE.1", "DEV.QUEUE.2"], channel="DEV.QUEUE.1")],
+                                      "QM1")
+
+        def metrics(kind, qmgr_name, name):
+            # a queue and a same-named channel must not share an issue count
+            return (10, 50.0, 1) if (kind, name) == (QUEUE, "DEV.QUEUE.1") else (None, None, 0)
+
+        clusters = GraphClusters(graph.to_compact(), 'prefix', metrics=metrics)
+        root = clusters.view()
+        self.assertEqual(root['cluster']['size'], 5)
+        self.assertEqual(root['cluster']['kinds'], {'queue': 3, 'application': 1, 'channel': 1})
+        self.assertEqual(root['cluster']['issues'], 1)
+        self.assertEqual([cluster['id'] for cluster in root['clusters']], ['prefix:QM1'])
+
+        qmgr_view = clusters.view('prefix:QM1')
+        self.assertIn({'source': 'prefix:QM1|application', 'target': 'prefix:QM1|queue', 'count': 2,
+                       'types': {'opens': 2}}, qmgr_view['edges'])
+
+        chain = clusters.cluster_of(graph.node_id(QUEUE, "QM1", "DEV.QUEUE.1"))
+        self.assertEqual(chain[-1], 'prefix:QM1|queue|DEV|DEV.QUEUE')
+        leaf_view = clusters.view(chain[-1], leaf_limit=1)
+        self.assertEqual(len(leaf_view['nodes']), 1)
+        self.assertEqual(leaf_view['truncated'], 1)
+        self.assertEqual(leaf_view['cluster']['depth'], 10)
+        self.assertEqual(leaf_view['external'], {'queue:QM1.DEV.QUEUE.1': {'out': 0, 'in': 1},
+                                                 'queue:QM1.DEV.QUEUE.2': {'out': 0, 'in': 1}})
+        self.assertIsNone(clusters.view('prefix:NOPE'))
+        self.assertIsNone(clusters.cluster_of('queue:QM1.NOPE'))
+
+    def test_05_layout_keeps_existing_positions(self):
+        queues = [make_queue(LocalQueue, "DEV.QUEUE.1"), make_queue(LocalQueue, "DEV.QUEUE.2")]
+        graph = DependencyGraph()
+        graph.create_dependency_graph(queues, [], [make_application("C1", ["DEV.QUEUE.1"])], "QM1")
+        layout = GraphLayout(2)
+        self.assertEqual(layout.update(graph.to_compact()), len(graph))
+        before = dict(zip(layout.ids, layout.coordinates.tolist()))
+
+        graph.sync(APPLICATION, "QM1", [make_application("C2", ["DEV.QUEUE.1", "DEV.QUEUE.2"])])
+        self.assertEqual(layout.update(graph.to_compact()), 1)  # only C2 is new
+        after = dict(zip(layout.ids, layout.coordinates.tolist()))
+        self.assertEqual(layout.version, graph.version)
+        self.assertNotIn("application:QM1.C1", after)
+        self.assertIn("application:QM1.C2", after)
+        for node_id, position in after.items():
+            if node_id in before:
+                self.assertEqual(position, before[node_id])
+
+
+
+class TestQueueAlertStates(unittest.TestCase):
+
+    def test_01_partial_snapshot_keeps_other_queues(self):
+        alert_states = QueueAlertStates(clear_margin=5, min_alert_interval=60, reminder_interval=300)
+        thresholds = [80.0, 80.0]
+        self.assertEqual(alert_states.update(["A", "B"], [90.0, 10.0], thresholds, [False, False], [0], now=0),
+                         [(0, EXCEEDED)])
+
+        # a filtered listing without A must neither clear nor forget it
+        self.assertEqual(alert_states.update(["B"], [10.0], [80.0], [False], [], now=1, partial=True), [])
+        self.assertEqual(alert_states.states(), {"A": "EXCEEDED"})
+        self.assertEqual(alert_states.update(["A", "B"], [90.0, 10.0], thresholds, [False, False], [0], now=2), [])
+
+        # a full snapshot without A means A is gone
+        alert_states.update(["B"], [10.0], [80.0], [False], [], now=3)
+        self.assertEqual(alert_states.states(), {})
+
 
 # If the script is executed directly, run the tests
 if __name__ == "__main__":